@@ -0,0 +1,85 @@
+"""Compares per-edge Graph.add with batched Graph.addN loading in YARSpgHandler.
+
+Node and edge statements are generated in memory and fed to the handler
+directly, so only the pass that resolves edges into triples and loads them
+into a fresh graph is timed, once per store and loading path. Batching does
+not make loading faster in any of the stores: building the rdflib terms of
+each edge in the handler dominates the pass, not the per-call store overhead,
+so YARSpgHandler defaults to per-edge Graph.add (`batch_size=1`).
+
+    python -m benchmarks.bench_graph_load --edges 10000000 --stores encoded,sqlite
+"""
+import argparse
+import math
+import os
+import tempfile
+import time
+from rdflib import Graph
+from yarspglib.parser.YARSpgHandler import YARSpgHandler
+from yarspglib.parser.YARSpgStatementReader import NodeStatement, EdgeStatement
+from yarspglib.store.EncodedMemoryStore import EncodedMemoryStore
+from yarspglib.store.SQLiteStore import SQLiteStore
+
+PREDICATES = 20
+
+
+def generate_statements(edges: int):
+    """
+    Yield the nodes and then `edges` distinct edges between sqrt-sized sets of
+    IRI subjects and language-tagged literal objects over `PREDICATES` predicates.
+    """
+    side = max(math.isqrt(edges // PREDICATES) + 1, 1)
+    for i in range(side):
+        yield NodeStatement(0, f"s{i}", ["IRI"], {'@value': f"http://example.org/resource/{i}"})
+        yield NodeStatement(0, f"o{i}", ["Literal"], {'@value': f"value {i}", '@lang': "en"})
+    for i in range(edges):
+        subject, rest = i % side, i // side
+        yield EdgeStatement(0, f"s{subject}", f"o{rest // PREDICATES}", ["IRI"],
+                            {'@value': f"http://example.org/p{rest % PREDICATES}"})
+
+
+def open_store(name: str, directory: str) -> Graph:
+    if name == 'memory':
+        return Graph()
+    if name == 'encoded':
+        return Graph(store=EncodedMemoryStore())
+    graph = Graph(store=SQLiteStore())
+    path = os.path.join(directory, "bench.sqlite")
+    graph.store.destroy(path)
+    graph.open(path, create=True)
+    return graph
+
+
+def load(store: str, edges: int, batch_size: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        graph = open_store(store, directory)
+        handler = YARSpgHandler(graph, batch_size)
+        start = time.perf_counter()
+        for statement in generate_statements(edges):
+            handler.process_statement(statement)
+        handler.flush()
+        size = len(graph)
+        elapsed = time.perf_counter() - start
+        graph.close()
+    if size != edges:
+        raise RuntimeError(f"Loaded {size} triples instead of {edges}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--edges', type=int, default=1000000, help='Number of edges to generate.')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Batch size for Graph.addN.')
+    parser.add_argument('--stores', type=str, default='memory,encoded,sqlite',
+                        help='Comma-separated stores to load: memory, encoded and sqlite.')
+    args = parser.parse_args()
+
+    print(f"{args.edges} edges, addN batches of {args.batch_size}")
+    for store in args.stores.split(','):
+        per_edge = load(store, args.edges, 1)
+        batched = load(store, args.edges, args.batch_size)
+        print(f"{store:>8}: Graph.add {per_edge:8.2f}s  Graph.addN {batched:8.2f}s  ({per_edge / batched:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compares value-based and lexical-form literal serialization in YARSpgSerializer.
+
+A literal-heavy N-Triples file (integers, decimals, doubles, dateTimes, dates
+and language-tagged strings) is generated, and three paths are timed:
+
+- serializing parsed rdflib Literals through their Python value, as the
+  serializer used to, against writing their lexical form with
+  `serialize_value`;
+- serializing N-Triples literal tokens through `from_n3`, as the parallel
+  workers used to, against `serialize_literal_term`;
+- parsing and serializing the whole file with rdflib's literal normalization
+  against parsing under `lexical_literals`.
+
+    python -m benchmarks.bench_literal_serialization --literals 200000
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+from rdflib import Graph, Literal
+from rdflib.util import from_n3
+from yarspglib.serializer.NTriplesTokenizer import tokenize_line
+from yarspglib.serializer.ParallelIngest import serialize_literal_term
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer, lexical_literals
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+def generate_ntriples(path: str, literals: int) -> None:
+    forms = [
+        lambda i: f'"{i:04d}"^^<{XSD}integer>',
+        lambda i: f'"{i}.25"^^<{XSD}decimal>',
+        lambda i: f'"{i}.5E0"^^<{XSD}double>',
+        lambda i: f'"2024-05-{i % 28 + 1:02d}T13:34:{i % 60:02d}Z"^^<{XSD}dateTime>',
+        lambda i: f'"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"^^<{XSD}date>',
+        lambda i: f'"value {i}"@en',
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(literals):
+            f.write(f"<http://example.org/s{i // 10}> <http://example.org/p{i % 6}> {forms[i % 6](i)} .\n")
+
+
+def value_based(serializer: YARSpgSerializer, value: Literal) -> str:
+    """
+    The former serialization, which went through the Python value of typed literals.
+    """
+    python_value = value.value
+    lexical = python_value if isinstance(python_value, str) else f"{python_value}"
+    return serializer.serialize_literal(lexical, value.datatype, value.language)
+
+
+def throughput(function, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        function(item)
+    return len(items) / (time.perf_counter() - start) / 1e6
+
+
+def serialize_file(path: str, lexical: bool) -> float:
+    start = time.perf_counter()
+    graph = Graph()
+    if lexical:
+        with lexical_literals():
+            graph.parse(path, format="nt")
+    else:
+        graph.parse(path, format="nt")
+    YARSpgSerializer(graph).serialize(io.BytesIO())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--literals', type=int, default=200000, help='Number of literal triples to generate.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "literals.nt")
+        generate_ntriples(path, args.literals)
+        with open(path, "r", encoding="utf-8") as f:
+            tokens = [tokenize_line(line)[2] for line in f]
+        serializer = YARSpgSerializer(Graph())
+        with lexical_literals():
+            literals = [from_n3(token) for token in tokens]
+
+        print(f"{args.literals} literals, M literals/s")
+        print(f"parsed Literal:  value {throughput(lambda value: value_based(serializer, value), literals):.2f}  "
+              f"lexical {throughput(serializer.serialize_value, literals):.2f}")
+        print(f"N-Triples token: from_n3 {throughput(lambda token: serializer.serialize_value(from_n3(token)), tokens):.2f}  "
+              f"lexical {throughput(lambda token: serialize_literal_term(serializer, token), tokens):.2f}")
+        print(f"serialize wholefile: normalized {serialize_file(path, False):.2f}s  "
+              f"lexical_literals {serialize_file(path, True):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
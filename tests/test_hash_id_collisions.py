@@ -0,0 +1,36 @@
+import io
+from rdflib import Graph, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF
+from yarspglib.parser.YARSpgProcessor import YARSpgProcessor
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer
+
+
+def reified_graph(count: int) -> Graph:
+    graph = Graph()
+    predicate = URIRef("http://ex.org/p")
+    for i in range(count):
+        subject, obj = URIRef(f"http://ex.org/s{i}"), URIRef(f"http://ex.org/o{i}")
+        graph.add((subject, predicate, obj))
+        statement = URIRef(f"http://ex.org/st{i}")
+        graph.add((statement, RDF.type, RDF.Statement))
+        graph.add((statement, RDF.subject, subject))
+        graph.add((statement, RDF.predicate, predicate))
+        graph.add((statement, RDF.object, obj))
+    return graph
+
+
+def test_colliding_hash_ids_are_renamed_in_reified_edges(monkeypatch):
+    # One base32 character leaves 32 short ids for 80 nodes
+    monkeypatch.setattr(YARSpgSerializer, 'HASH_ID_LENGTH', 1)
+    graph = reified_graph(40)
+    serializer = YARSpgSerializer(graph, id_scheme='hash', collapse_reification=True)
+    stream = io.BytesIO()
+    serializer.serialize(stream)
+    assert serializer._colliding_ids
+    assert {edge[0] for edge in serializer.reified_edges} | {edge[2] for edge in serializer.reified_edges} \
+        <= set(serializer.nodes)
+
+    processor = YARSpgProcessor(expand_reification=True)
+    processor.process_YARSpg_stream(io.BytesIO(stream.getvalue()))
+    assert isomorphic(processor.graph, graph)
@@ -0,0 +1,55 @@
+import io
+import re
+import rdflib
+from rdflib import Graph
+from yarspglib.serializer.ParallelIngest import ParallelNTriplesIngest
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer, lexical_literals
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+NTRIPLES = f"""<http://ex.org/s> <http://ex.org/p> "0042"^^<{XSD}integer> .
+<http://ex.org/s> <http://ex.org/p> "42"^^<{XSD}integer> .
+<http://ex.org/s> <http://ex.org/t> "2024-05-01T13:34:00Z"^^<{XSD}dateTime> .
+<http://ex.org/s> <http://ex.org/d> "1.5E0"^^<{XSD}double> .
+"""
+NODE_ID = re.compile(r'^\([so]\d+ ')
+
+
+def node_values(yarspg: str) -> list:
+    return sorted(NODE_ID.sub('', line) for line in yarspg.splitlines() if NODE_ID.match(line))
+
+
+def sequential(path) -> str:
+    graph = Graph()
+    with lexical_literals():
+        graph.parse(path, format="nt")
+    stream = io.BytesIO()
+    YARSpgSerializer(graph).serialize(stream)
+    return stream.getvalue().decode("utf-8")
+
+
+def parallel(path) -> str:
+    ingest = ParallelNTriplesIngest(str(path), jobs=1)
+    ingest.run()
+    stream = io.BytesIO()
+    ingest.serialize(stream)
+    return stream.getvalue().decode("utf-8")
+
+
+def test_sequential_serializer_keeps_lexical_forms(tmp_path):
+    path = tmp_path / "literals.nt"
+    path.write_text(NTRIPLES, encoding="utf-8")
+    values = node_values(sequential(path))
+    for lexical in ("0042", "42", "2024-05-01T13:34:00Z", "1.5E0"):
+        assert any(f'"@value": "{lexical}"' in value for value in values)
+
+
+def test_sequential_and_parallel_serializers_write_the_same_nodes(tmp_path):
+    path = tmp_path / "literals.nt"
+    path.write_text(NTRIPLES, encoding="utf-8")
+    assert node_values(sequential(path)) == node_values(parallel(path))
+
+
+def test_lexical_literals_restores_normalization():
+    with lexical_literals():
+        assert rdflib.NORMALIZE_LITERALS is False
+    assert rdflib.NORMALIZE_LITERALS is True
@@ -0,0 +1,44 @@
+import io
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+from yarspglib.parser.YARSpgProcessor import YARSpgProcessor
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer
+
+CONTROL_STRING = "tab\there\r\u0001x\u0000\u001b\u007f\\u0001 \"quoted\"\nend"
+
+
+def control_graph() -> Graph:
+    graph = Graph()
+    subject = URIRef("http://ex.org/s")
+    graph.add((subject, URIRef("http://ex.org/plain"), Literal(CONTROL_STRING)))
+    graph.add((subject, URIRef("http://ex.org/tagged"), Literal(CONTROL_STRING, lang="en")))
+    graph.add((subject, URIRef("http://ex.org/all"), Literal("".join(map(chr, [*range(0x20), 0x7f])))))
+    return graph
+
+
+def serialize(graph: Graph, **options) -> bytes:
+    stream = io.BytesIO()
+    YARSpgSerializer(graph, **options).serialize(stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("options", [{}, {'fold_literals': True}])
+def test_control_characters_round_trip_through_statement_reader(options):
+    graph = control_graph()
+    processor = YARSpgProcessor()
+    processor.process_YARSpg_stream(io.BytesIO(serialize(graph, **options)))
+    assert isomorphic(processor.graph, graph)
+
+
+@pytest.mark.parametrize("options", [{}, {'fold_literals': True}])
+def test_control_characters_round_trip_through_antlr_parser(options):
+    graph = control_graph()
+    processor = YARSpgProcessor()
+    processor.process_YARSpg(serialize(graph, **options).decode("utf-8"))
+    assert isomorphic(processor.graph, graph)
+
+
+def test_serialized_lines_hold_no_raw_control_characters():
+    for line in serialize(control_graph()).decode("utf-8").splitlines():
+        assert line.isprintable()
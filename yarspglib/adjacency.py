@@ -0,0 +1,119 @@
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader, NodeStatement, EdgeStatement
+from yarspglib.ycol_snapshot import YColSnapshot
+
+
+class CSRAdjacency:
+    """
+    Compressed sparse row adjacency over a parsed YARS-PG edge list.
+
+    Edges are stored twice, grouped by source (`out`) and by target (`in`). Each
+    direction has an `indptr` array with one entry per node plus one, and
+    `indices` and `predicates` arrays with one entry per edge. Node and
+    predicate arguments are integer codes; `node_index` and `predicate_codes`
+    translate YARS-PG node ids and predicate IRIs.
+    """
+
+    def __init__(self, sources: np.ndarray, targets: np.ndarray, predicates: np.ndarray, node_count: int,
+                 node_ids: Optional[list] = None, predicate_values: Optional[list] = None):
+        self.node_count = node_count
+        self.node_ids = node_ids
+        self.predicate_values = predicate_values
+        self._node_index = None
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        predicates = np.asarray(predicates, dtype=np.int32)
+        self.out_indptr, self.out_indices, self.out_predicates = self._build(sources, targets, predicates)
+        self.in_indptr, self.in_indices, self.in_predicates = self._build(targets, sources, predicates)
+
+    def _build(self, keys: np.ndarray, values: np.ndarray, predicates: np.ndarray) -> Tuple[np.ndarray, ...]:
+        order = np.argsort(keys, kind='stable')
+        indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=self.node_count), out=indptr[1:])
+        return indptr, values[order], predicates[order]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: YColSnapshot) -> "CSRAdjacency":
+        return cls(snapshot.edge_sources, snapshot.edge_targets, snapshot.edge_predicates, snapshot.node_count,
+                   list(snapshot.node_ids), list(snapshot.predicates))
+
+    @classmethod
+    def from_yarspg(cls, yarspg_file: str) -> "CSRAdjacency":
+        node_index, predicate_codes = {}, {}
+        sources, targets, predicates = [], [], []
+        with open(yarspg_file, "rb") as f:
+            for statement in YARSpgStatementReader(f):
+                if isinstance(statement, NodeStatement):
+                    node_index.setdefault(statement.id, len(node_index))
+                elif isinstance(statement, EdgeStatement):
+                    sources.append(node_index.setdefault(statement.source, len(node_index)))
+                    targets.append(node_index.setdefault(statement.target, len(node_index)))
+                    predicates.append(predicate_codes.setdefault(statement.props.get('@value'), len(predicate_codes)))
+        return cls(np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64),
+                   np.array(predicates, dtype=np.int32), len(node_index), list(node_index), list(predicate_codes))
+
+    def node_index(self, node_ids: Iterable[str]) -> np.ndarray:
+        """
+        Translate YARS-PG node ids to node codes.
+        """
+        if self._node_index is None:
+            self._node_index = {n_id: index for index, n_id in enumerate(self.node_ids)}
+        return np.array([self._node_index[n_id] for n_id in node_ids], dtype=np.int64)
+
+    def predicate_codes(self, predicates: Iterable[str]) -> np.ndarray:
+        """
+        Translate predicate IRIs to predicate codes, skipping unknown ones.
+        """
+        codes = {value: code for code, value in enumerate(self.predicate_values)}
+        return np.array([codes[p] for p in predicates if p in codes], dtype=np.int32)
+
+    def _direction(self, direction: str) -> Tuple[np.ndarray, ...]:
+        if direction == 'out':
+            return self.out_indptr, self.out_indices, self.out_predicates
+        if direction == 'in':
+            return self.in_indptr, self.in_indices, self.in_predicates
+        raise ValueError(f"Unknown direction: {direction}")
+
+    def neighbors(self, nodes, direction: str = 'out', predicates=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Look up the neighbors of a batch of nodes.
+
+        Returns three aligned arrays: the position in `nodes` each edge belongs
+        to, the neighbor node code and the predicate code. `direction` is `out`,
+        `in` or `both`; `predicates` optionally restricts the predicate codes.
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        if direction == 'both':
+            parts = [self.neighbors(nodes, 'out', predicates), self.neighbors(nodes, 'in', predicates)]
+            return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+        indptr, indices, edge_predicates = self._direction(direction)
+        starts = indptr[nodes]
+        counts = indptr[nodes + 1] - starts
+        origins = np.repeat(np.arange(len(nodes)), counts)
+        edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        neighbors, found_predicates = indices[edges], edge_predicates[edges]
+        if predicates is not None:
+            mask = np.isin(found_predicates, np.asarray(predicates, dtype=np.int32))
+            origins, neighbors, found_predicates = origins[mask], neighbors[mask], found_predicates[mask]
+        return origins, neighbors, found_predicates
+
+    def k_hop(self, seeds, k: int, direction: str = 'out', predicates=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Breadth-first expansion from `seeds` up to `k` hops.
+
+        Returns the reached node codes, seeds included, and their hop distance.
+        Each hop expands the whole frontier with a single `neighbors` call.
+        """
+        distance = np.full(self.node_count, -1, dtype=np.int32)
+        frontier = np.unique(np.asarray(seeds, dtype=np.int64))
+        distance[frontier] = 0
+        for hop in range(1, k + 1):
+            if len(frontier) == 0:
+                break
+            _, reached, _ = self.neighbors(frontier, direction, predicates)
+            reached = np.unique(reached)
+            frontier = reached[distance[reached] < 0]
+            distance[frontier] = hop
+        nodes = np.flatnonzero(distance >= 0)
+        return nodes, distance[nodes]
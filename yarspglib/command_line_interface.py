@@ -1,6 +1,8 @@
 import argparse
+import os
+from yarspglib.graph_filter import EdgeFilter
 from yarspglib.yarspg_operations_handler import (
-    serialize_rdf_to_yarspg, parse_yarspg,
+    serialize_rdf_to_yarspg, serialize_rdf_to_shards, append_rdf_to_yarspg, parse_yarspg, convert_yarspg, lookup_yarspg, stats_yarspg, filter_yarspg, diff_yarspg_files, merge_yarspg,
     compress_file, decompress_file, combine_sections, split_yarspg
 )
 
@@ -23,16 +25,25 @@ class CommandLineInterface:
             prog='yarspglib'
         )
 
-        subparsers = parser.add_subparsers(dest='action', required=True, help='Action to perform: serialize or parse.')
+        subparsers = parser.add_subparsers(dest='action', required=True, help='Action to perform: serialize, parse, convert, lookup, stats, filter, diff or merge.')
 
         serialize_parser = subparsers.add_parser('serialize', help='Serialize RDF to YARS-PG.')
-        serialize_subparsers = serialize_parser.add_subparsers(dest='type', required=True, help='Type of serialization: wholefile or sections.')
+        serialize_subparsers = serialize_parser.add_subparsers(dest='type', required=True, help='Type of serialization: wholefile, sections or append.')
 
         serialize_wholefile_parser = serialize_subparsers.add_parser('wholefile', help='Serialize entire RDF file to YARS-PG.')
         serialize_wholefile_parser.add_argument('input', type=str, help='Input RDF file.')
-        serialize_wholefile_parser.add_argument('output', type=str, help='Output YARS-PG file.')
+        serialize_wholefile_parser.add_argument('output', type=str, help='Output YARS-PG file, or directory when --shards is given.')
+        serialize_wholefile_parser.add_argument('--shards', type=int, help='Partition the output into this many self-contained YARS-PG files with a manifest.')
         serialize_wholefile_parser.add_argument('--compression', type=str, choices=['gzip', 'brotli', 'zstd', 'snappy'], help='Compression method.')
         serialize_wholefile_parser.add_argument('-l', '--level', type=int, help='Compression level (only for gzip, brotli, zstd).')
+        serialize_wholefile_parser.add_argument('--id-scheme', type=str, choices=['counter', 'hash'], default='counter', help='Node ids: s<n>/o<n> counters (default) or deterministic ids hashed from the node term.')
+        serialize_wholefile_parser.add_argument('-j', '--jobs', type=int, help='Tokenize and encode the N-Triples input in this many worker processes.')
+        serialize_wholefile_parser.add_argument('--predicate-variables', action='store_true', help='Declare each predicate IRI once as a variable and reference it from the edges.')
+        serialize_wholefile_parser.add_argument('--prefixes', action='store_true', help='Declare frequent IRI namespaces as prefixes in a metadata statement and write compact IRIs.')
+        serialize_wholefile_parser.add_argument('--fold-literals', action='store_true', help='Store literal-valued triples as properties of the subject node instead of literal nodes and edges.')
+        serialize_wholefile_parser.add_argument('--type-labels', action='store_true', help='Write rdf:type objects as extra node labels instead of edges.')
+        serialize_wholefile_parser.add_argument('--collapse-reification', action='store_true', help='Write each rdf:Statement reification as a single edge with an id and properties.')
+        serialize_wholefile_parser.add_argument('--native-types', action='store_true', help='Write XSD numeric, boolean and date literals with native YARS-PG type labels instead of datatype IRIs.')
 
         serialize_sections_parser = serialize_subparsers.add_parser('sections', help='Serialize RDF file to YARS-PG with separate nodes and edges sections.')
         serialize_sections_parser.add_argument('input', type=str, help='Input RDF file.')
@@ -40,6 +51,19 @@ class CommandLineInterface:
         serialize_sections_parser.add_argument('--output-edges', type=str, required=True, help='Output YARS-PG file for edges.')
         serialize_sections_parser.add_argument('--compression', type=str, choices=['gzip', 'brotli', 'zstd', 'snappy'], help='Compression method.')
         serialize_sections_parser.add_argument('-l', '--level', type=int, help='Compression level (only for gzip, brotli, zstd).')
+        serialize_sections_parser.add_argument('--id-scheme', type=str, choices=['counter', 'hash'], default='counter', help='Node ids: s<n>/o<n> counters (default) or deterministic ids hashed from the node term.')
+        serialize_sections_parser.add_argument('-j', '--jobs', type=int, help='Tokenize and encode the N-Triples input in this many worker processes.')
+        serialize_sections_parser.add_argument('--predicate-variables', action='store_true', help='Declare each predicate IRI once as a variable and reference it from the edges.')
+        serialize_sections_parser.add_argument('--prefixes', action='store_true', help='Declare frequent IRI namespaces as prefixes in a metadata statement and write compact IRIs.')
+        serialize_sections_parser.add_argument('--fold-literals', action='store_true', help='Store literal-valued triples as properties of the subject node instead of literal nodes and edges.')
+        serialize_sections_parser.add_argument('--type-labels', action='store_true', help='Write rdf:type objects as extra node labels instead of edges.')
+        serialize_sections_parser.add_argument('--collapse-reification', action='store_true', help='Write each rdf:Statement reification as a single edge with an id and properties.')
+        serialize_sections_parser.add_argument('--native-types', action='store_true', help='Write XSD numeric, boolean and date literals with native YARS-PG type labels instead of datatype IRIs.')
+
+        serialize_append_parser = serialize_subparsers.add_parser('append', help='Append the triples of an RDF file to an existing YARS-PG file as a new segment.')
+        serialize_append_parser.add_argument('input', type=str, help='Input RDF file with the new triples.')
+        serialize_append_parser.add_argument('output', type=str, help='YARS-PG file to append to. Created if missing.')
+        serialize_append_parser.add_argument('--dictionary', type=str, help='Node dictionary directory. Defaults to OUTPUT.ydict; built on first use.')
 
         parse_parser = subparsers.add_parser('parse', help='Parse YARS-PG to RDF.')
         parse_subparsers = parse_parser.add_subparsers(dest='type', required=True, help='Type of parsing: wholefile or sections.')
@@ -49,6 +73,8 @@ class CommandLineInterface:
         parse_wholefile_parser.add_argument('output', type=str, help='Output RDF file.')
         parse_wholefile_parser.add_argument('--compression', type=str, choices=['gzip', 'brotli', 'zstd', 'snappy'], help='Decompression method.')
         parse_wholefile_parser.add_argument('--format', type=str, default='nt', help='Output RDF format. N-Triples is default output format')
+        parse_wholefile_parser.add_argument('--store', type=str, help='RDF store used to hold the parsed graph: memory, encoded or sqlite:PATH. Without it, nt, nq and turtle output is streamed.')
+        parse_wholefile_parser.add_argument('--expand-reification', action='store_true', help='Restore the rdf:Statement reifications of collapsed edges.')
 
         parse_sections_parser = parse_subparsers.add_parser('sections', help='Parse YARS-PG files with separate nodes and edges sections to RDF.')
         parse_sections_parser.add_argument('--input-nodes', type=str, required=True, help='Input YARS-PG file for nodes.')
@@ -56,6 +82,50 @@ class CommandLineInterface:
         parse_sections_parser.add_argument('output', type=str, help='Output RDF file.')
         parse_sections_parser.add_argument('--compression', type=str, choices=['gzip', 'brotli', 'zstd', 'snappy'], help='Decompression method.')
         parse_sections_parser.add_argument('--format', type=str, default='nt', help='Output RDF format. N-Triples is default output format')
+        parse_sections_parser.add_argument('--store', type=str, help='RDF store used to hold the parsed graph: memory, encoded or sqlite:PATH. Without it, nt, nq and turtle output is streamed.')
+        parse_sections_parser.add_argument('--expand-reification', action='store_true', help='Restore the rdf:Statement reifications of collapsed edges.')
+
+        convert_parser = subparsers.add_parser('convert', help='Convert YARS-PG files and ycol snapshots.')
+        convert_parser.add_argument('input', type=str, help='Input YARS-PG file or ycol snapshot directory.')
+        convert_parser.add_argument('output', type=str, help='Output file, or directory for ycol snapshots.')
+        convert_parser.add_argument('--to', type=str, required=True, help='Target format: ycol, yarspg (from a snapshot) or an RDF format such as nt or turtle.')
+        convert_parser.add_argument('--expand-reification', action='store_true', help='Restore the rdf:Statement reifications of collapsed edges in RDF output.')
+
+        lookup_parser = subparsers.add_parser('lookup', help='Print the statements of nodes by id using a sidecar index.')
+        lookup_parser.add_argument('input', type=str, help='Input YARS-PG file.')
+        lookup_parser.add_argument('ids', type=str, nargs='+', help='Node ids to look up.')
+        lookup_parser.add_argument('--index', type=str, help='Index directory. Defaults to INPUT.yidx; built on first use.')
+
+        stats_parser = subparsers.add_parser('stats', help='Compute graph statistics of a YARS-PG or N-Triples file.')
+        stats_parser.add_argument('input', type=str, help='Input YARS-PG or N-Triples file.')
+        stats_parser.add_argument('--format', type=str, choices=['yarspg', 'nt'], help='Input format. Defaults to nt for .nt and .ntriples files, yarspg otherwise.')
+        stats_parser.add_argument('--top', type=int, default=10, help='Number of most frequent predicates to report.')
+        stats_parser.add_argument('--approximate', action='store_true', help='Estimate distinct counts and top nodes with HyperLogLog and count-min sketches in constant memory.')
+        stats_parser.add_argument('-o', '--output', type=str, help='Output JSON file. Printed to standard output by default.')
+
+        filter_parser = subparsers.add_parser('filter', help='Extract the edges matching predicate, label or seed filters and the nodes they reference.')
+        filter_parser.add_argument('input', type=str, help='Input YARS-PG file.')
+        filter_parser.add_argument('output', type=str, help='Output file.')
+        filter_parser.add_argument('--predicate', type=str, action='append', help='Keep edges with this predicate IRI. May be repeated.')
+        filter_parser.add_argument('--label', type=str, action='append', help='Keep edges with this edge label. May be repeated.')
+        filter_parser.add_argument('--target-label', type=str, action='append', help='Keep edges whose target node has this label, e.g. Literal. May be repeated.')
+        filter_parser.add_argument('--seeds', type=str, nargs='+', help='Keep edges from or to these node ids.')
+        filter_parser.add_argument('--seeds-file', type=str, help='File with one seed node id per line.')
+        filter_parser.add_argument('--format', type=str, default='yarspg', help='Output format: yarspg (default) or an RDF format such as nt or turtle.')
+        filter_parser.add_argument('--index', type=str, help='Sidecar index directory used to read node statements in a single pass. Defaults to INPUT.yidx when it exists.')
+        filter_parser.add_argument('--expand-reification', action='store_true', help='Restore the rdf:Statement reifications of collapsed edges in RDF output.')
+
+        diff_parser = subparsers.add_parser('diff', help='Compute the edges added and removed between two YARS-PG files.')
+        diff_parser.add_argument('old', type=str, help='Old YARS-PG file.')
+        diff_parser.add_argument('new', type=str, help='New YARS-PG file.')
+        diff_parser.add_argument('--added', type=str, required=True, help='Output file for added edges.')
+        diff_parser.add_argument('--removed', type=str, required=True, help='Output file for removed edges.')
+        diff_parser.add_argument('--format', type=str, choices=['nt', 'yarspg'], default='nt', help='Patch format. N-Triples is default.')
+
+        merge_parser = subparsers.add_parser('merge', help='Merge YARS-PG files, remapping node ids and deduplicating nodes by term.')
+        merge_parser.add_argument('inputs', type=str, nargs='+', help='Input YARS-PG files.')
+        merge_parser.add_argument('-o', '--output', type=str, required=True, help='Output YARS-PG file.')
+        merge_parser.add_argument('--max-memory-nodes', type=int, default=1000000, help='Number of node terms kept in memory before the dictionary moves to a temporary SQLite file.')
 
         return parser.parse_args()
 
@@ -65,18 +135,51 @@ class CommandLineInterface:
             self.serialize()
         elif self.args.action == 'parse':
             self.parse()
+        elif self.args.action == 'convert':
+            self.convert()
+        elif self.args.action == 'lookup':
+            lookup_yarspg(self.args.input, self.args.ids, self.args.index)
+        elif self.args.action == 'stats':
+            stats_yarspg(self.args.input, self.args.format, self.args.top, self.args.output, self.args.approximate)
+        elif self.args.action == 'filter':
+            self.filter()
+        elif self.args.action == 'merge':
+            merge_yarspg(self.args.inputs, self.args.output, self.args.max_memory_nodes)
+        elif self.args.action == 'diff':
+            diff_yarspg_files(self.args.old, self.args.new, self.args.added, self.args.removed, self.args.format)
 
     def serialize(self):
         """Serializes the RDF file to YARS-PG and compresses if needed."""
-        if self.args.type == 'wholefile':
-            serialize_rdf_to_yarspg(self.args.input, self.args.output)
+        if self.args.type == 'wholefile' and self.args.shards:
+            if self.args.jobs:
+                raise ValueError("--jobs cannot be combined with --shards")
+            serialize_rdf_to_shards(self.args.input, self.args.output, self.args.shards, self.args.id_scheme,
+                                    self.args.predicate_variables, self.args.prefixes, self.args.fold_literals,
+                                    self.args.type_labels, self.args.collapse_reification,
+                                    self.args.native_types)
+            if self.args.compression:
+                for shard in sorted(os.listdir(self.args.output)):
+                    if shard.endswith(".yarspg"):
+                        shard_file = os.path.join(self.args.output, shard)
+                        compress_file(shard_file, f"{shard_file}.{self.args.compression}", self.args.compression, self.args.level)
+        elif self.args.type == 'wholefile':
+            serialize_rdf_to_yarspg(self.args.input, self.args.output, self.args.id_scheme, self.args.jobs,
+                                    self.args.predicate_variables, self.args.prefixes, self.args.fold_literals,
+                                    self.args.type_labels, self.args.collapse_reification,
+                                    self.args.native_types)
             print(f"Serialized file created: {self.args.output}")
             if self.args.compression:
                 compressed_output = f"{self.args.output}.{self.args.compression}"
                 compress_file(self.args.output, compressed_output, self.args.compression, self.args.level)
+        elif self.args.type == 'append':
+            append_rdf_to_yarspg(self.args.input, self.args.output, self.args.dictionary)
+            print(f"Serialized triples appended to: {self.args.output}")
         elif self.args.type == 'sections':
             temp_file = f"{self.args.input}.temp"
-            serialize_rdf_to_yarspg(self.args.input, temp_file)
+            serialize_rdf_to_yarspg(self.args.input, temp_file, self.args.id_scheme, self.args.jobs,
+                                    self.args.predicate_variables, self.args.prefixes, self.args.fold_literals,
+                                    self.args.type_labels, self.args.collapse_reification,
+                                    self.args.native_types)
             nodes_section, edges_section = split_yarspg(temp_file)
 
             with open(self.args.output_nodes, "w", encoding="utf-8") as f:
@@ -92,6 +195,21 @@ class CommandLineInterface:
 
                 compress_file(self.args.output_edges, f"{self.args.output_edges}.{self.args.compression}", self.args.compression, self.args.level)
 
+    def convert(self):
+        """Converts a YARS-PG file or ycol snapshot to the target format."""
+        convert_yarspg(self.args.input, self.args.output, self.args.to, self.args.expand_reification)
+        print(f"Converted file created: {self.args.output}")
+
+    def filter(self):
+        """Extracts the subgraph selected by the filter options."""
+        seeds = list(self.args.seeds or [])
+        if self.args.seeds_file:
+            with open(self.args.seeds_file, "r", encoding="utf-8") as f:
+                seeds.extend(line.strip() for line in f if line.strip())
+        edge_filter = EdgeFilter(self.args.predicate, self.args.label, self.args.target_label, seeds)
+        filter_yarspg(self.args.input, self.args.output, edge_filter, self.args.format, self.args.index,
+                      self.args.expand_reification)
+
     def parse(self):
         """Decompresses the YARS-PG file if needed and parses it to RDF."""
         if self.args.type == 'wholefile':
@@ -99,9 +217,11 @@ class CommandLineInterface:
                 decompressed_input = f"{self.args.input}.decompressed"
                 decompress_file(self.args.input, decompressed_input, self.args.compression)
 
-                parse_yarspg(decompressed_input, self.args.output, self.args.format)
+                parse_yarspg(decompressed_input, self.args.output, self.args.format, self.args.store,
+                             self.args.expand_reification)
             else:
-                parse_yarspg(self.args.input, self.args.output, self.args.format)
+                parse_yarspg(self.args.input, self.args.output, self.args.format, self.args.store,
+                             self.args.expand_reification)
             print(f"Parsed file created: {self.args.output}")
         elif self.args.type == 'sections':
             if self.args.compression:
@@ -110,10 +230,12 @@ class CommandLineInterface:
                 decompress_file(self.args.input_nodes, decompressed_nodes, self.args.compression)
                 decompress_file(self.args.input_edges, decompressed_edges, self.args.compression)
                 combine_sections(decompressed_nodes, decompressed_edges, "combined.yarspg")
-                parse_yarspg("combined.yarspg", self.args.output, self.args.format)
+                parse_yarspg("combined.yarspg", self.args.output, self.args.format, self.args.store,
+                             self.args.expand_reification)
             else:
                 combine_sections(self.args.input_nodes, self.args.input_edges, "combined.yarspg")
-                parse_yarspg("combined.yarspg", self.args.output, self.args.format)
+                parse_yarspg("combined.yarspg", self.args.output, self.args.format, self.args.store,
+                             self.args.expand_reification)
             print(f"Parsed file created: {self.args.output}")
 
 
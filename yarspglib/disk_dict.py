@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import tempfile
+from typing import Optional
+
+
+class DiskBackedDict:
+    """
+    String-to-string mapping that moves to a temporary SQLite database once it
+    outgrows memory.
+
+    Entries live in a plain dict until there are `max_memory_items` of them.
+    From then on they are stored in a SQLite table keyed by the string; new
+    entries are buffered and inserted in batches of `batch_size`, and lookups
+    check the buffer before querying the table. The database file is removed
+    on `close`.
+    """
+
+    def __init__(self, max_memory_items: int = 1000000, batch_size: int = 10000, temp_dir: Optional[str] = None):
+        self.max_memory_items = max_memory_items
+        self.batch_size = batch_size
+        self.temp_dir = temp_dir
+        self._memory = {}
+        self._pending = {}
+        self._connection = None
+        self._path = None
+        self._size = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self._connection is not None
+
+    def spill(self) -> None:
+        """
+        Move the entries to the temporary database now, e.g. when the caller
+        expects more than `max_memory_items` of them.
+        """
+        if self.spilled:
+            return
+        fd, self._path = tempfile.mkstemp(suffix=".sqlite", dir=self.temp_dir)
+        os.close(fd)
+        self._connection = sqlite3.connect(self._path)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+        self._pending = self._memory
+        self._memory = {}
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?)", self._pending.items())
+            self._pending = {}
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        if not self.spilled:
+            return self._memory.get(key, default)
+        value = self._pending.get(key)
+        if value is not None:
+            return value
+        row = self._connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> str:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: str) -> None:
+        if not self.spilled:
+            if key not in self._memory:
+                self._size += 1
+            self._memory[key] = value
+            if self._size >= self.max_memory_items:
+                self.spill()
+            return
+        if key not in self:
+            self._size += 1
+        self._pending[key] = value
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        self._memory = {}
+        self._pending = {}
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            os.remove(self._path)
@@ -0,0 +1,56 @@
+import heapq
+import os
+import tempfile
+from typing import Iterable, Iterator, Optional
+
+
+def _write_run(records: list, directory: str) -> str:
+    records.sort()
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+        f.writelines(record + "\n" for record in records)
+    return path
+
+
+def _read_run(path: str) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8", newline="\n") as f:
+        for line in f:
+            yield line[:-1]
+
+
+def external_sort(records: Iterable[str], chunk_size: int = 500000, unique: bool = False,
+                  temp_dir: Optional[str] = None) -> Iterator[str]:
+    """
+    Sort newline-free string records with bounded memory.
+
+    Records are sorted in memory in chunks of `chunk_size`, each chunk is
+    written to a temporary run file, and the runs are merged lazily with
+    `heapq.merge`. Input that fits in a single chunk never touches the disk.
+    With `unique`, consecutive duplicates are dropped from the output.
+    """
+    directory = tempfile.mkdtemp(prefix="yarspg-sort-", dir=temp_dir)
+    runs, chunk = [], []
+    try:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                runs.append(_write_run(chunk, directory))
+                chunk = []
+        if runs:
+            if chunk:
+                runs.append(_write_run(chunk, directory))
+            chunk = []
+            merged = heapq.merge(*(_read_run(path) for path in runs))
+        else:
+            chunk.sort()
+            merged = iter(chunk)
+        previous = None
+        for record in merged:
+            if unique and record == previous:
+                continue
+            previous = record
+            yield record
+    finally:
+        for path in runs:
+            os.remove(path)
+        os.rmdir(directory)
@@ -0,0 +1,116 @@
+from typing import Iterator, Optional, Tuple
+from rdflib import Literal, URIRef, RDF
+from rdflib.plugins.serializers.nt import _quoteLiteral
+from yarspglib.external_sort import external_sort
+from yarspglib.parser.YARSpgHandler import YARSpgHandler
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader, NodeStatement, EdgeStatement
+
+SEPARATOR = "\x1f"
+
+
+def _nt_term(term) -> str:
+    return _quoteLiteral(term) if isinstance(term, Literal) else term.n3()
+
+
+def edge_rows(yarspg_file: str, chunk_size: int = 500000, temp_dir: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the edges of a YARS-PG file as sorted, unique N-Triples rows.
+
+    Node ids are resolved to terms with two sort-merge joins, so memory stays
+    bounded by `chunk_size` records. The first sort groups every node
+    statement with the edges leaving it and substitutes the subject term; the
+    second groups it with the edges arriving at it and substitutes the object
+    term. Type labels and literal properties folded into a node statement are
+    complete rows already and pass through both joins unchanged. A collapsed
+    reification yields its asserted triple as an ordinary edge, the reifier's
+    type, predicate and annotation rows as complete rows, and its
+    `rdf:subject`/`rdf:object` rows as records that the join keyed by the
+    source or target id completes. A final sort orders and deduplicates the
+    rows.
+    """
+    handler = YARSpgHandler(None)
+
+    def sources():
+        with open(yarspg_file, "rb") as f:
+            for statement in YARSpgStatementReader(f):
+                if isinstance(statement, NodeStatement):
+                    term = handler.node_term({'type': statement.labels[0] if statement.labels else 'IRI',
+                                              'properties': statement.props})
+                    yield SEPARATOR.join((statement.id, "0", _nt_term(term)))
+                    for label in statement.labels[1:]:
+                        yield SEPARATOR.join((statement.id, "2", f"{term.n3()} {RDF.type.n3()} "
+                                                                 f"{URIRef(handler.encode_uri(label)).n3()} ."))
+                    for key, value in statement.props.items():
+                        if not key.startswith('@'):
+                            predicate = URIRef(handler.encode_uri(key)).n3()
+                            for literal in handler.property_terms(value):
+                                yield SEPARATOR.join((statement.id, "2", f"{term.n3()} {predicate} {_nt_term(literal)} ."))
+                elif isinstance(statement, EdgeStatement):
+                    predicate = URIRef(handler.encode_uri(statement.props.get('@value', '')))
+                    if statement.props.get('@asserted') != 'false':
+                        yield SEPARATOR.join((statement.source, "1", statement.target, predicate.n3()))
+                    if '@reifier' in statement.props:
+                        yield from reification_records(statement, predicate)
+
+    def reification_records(statement, predicate):
+        reifier = URIRef(handler.encode_uri(statement.props['@reifier'])).n3()
+        yield SEPARATOR.join((statement.source, "2", f"{reifier} {RDF.type.n3()} {RDF.Statement.n3()} ."))
+        yield SEPARATOR.join((statement.source, "2", f"{reifier} {RDF.predicate.n3()} {predicate.n3()} ."))
+        yield SEPARATOR.join((statement.source, "3", f"{reifier} {RDF.subject.n3()}"))
+        yield SEPARATOR.join((statement.target, "3", f"{reifier} {RDF.object.n3()}"))
+        for key, value in statement.props.items():
+            if not key.startswith('@'):
+                annotation = URIRef(handler.encode_uri(key)).n3()
+                for item in handler.property_terms(value):
+                    yield SEPARATOR.join((statement.source, "2", f"{reifier} {annotation} {_nt_term(item)} ."))
+
+    def targets():
+        node_id, term = None, None
+        for record in external_sort(sources(), chunk_size, temp_dir=temp_dir):
+            fields = record.split(SEPARATOR)
+            if fields[1] == "0":
+                node_id, term = fields[0], fields[2]
+                yield record
+            elif fields[1] == "2":
+                yield record
+            elif fields[0] != node_id:
+                raise ValueError(f"Edge references undefined node {fields[0]}")
+            elif fields[1] == "3":
+                yield SEPARATOR.join((node_id, "2", f"{fields[2]} {term} ."))
+            else:
+                yield SEPARATOR.join((fields[2], "1", term, fields[3]))
+
+    def rows():
+        node_id, term = None, None
+        for record in external_sort(targets(), chunk_size, temp_dir=temp_dir):
+            fields = record.split(SEPARATOR)
+            if fields[1] == "0":
+                node_id, term = fields[0], fields[2]
+            elif fields[1] == "2":
+                yield fields[2]
+            elif fields[0] == node_id:
+                yield f"{fields[2]} {fields[3]} {term} ."
+            else:
+                raise ValueError(f"Edge references undefined node {fields[0]}")
+
+    return external_sort(rows(), chunk_size, unique=True, temp_dir=temp_dir)
+
+
+def diff_yarspg(old_file: str, new_file: str, chunk_size: int = 500000,
+                temp_dir: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Merge-compare the sorted edge rows of two YARS-PG files and yield
+    `('-', row)` for removed edges and `('+', row)` for added ones.
+    """
+    old_rows = edge_rows(old_file, chunk_size, temp_dir)
+    new_rows = edge_rows(new_file, chunk_size, temp_dir)
+    old_row, new_row = next(old_rows, None), next(new_rows, None)
+    while old_row is not None or new_row is not None:
+        if new_row is None or (old_row is not None and old_row < new_row):
+            yield '-', old_row
+            old_row = next(old_rows, None)
+        elif old_row is None or new_row < old_row:
+            yield '+', new_row
+            new_row = next(new_rows, None)
+        else:
+            old_row, new_row = next(old_rows, None), next(new_rows, None)
@@ -0,0 +1,155 @@
+import tempfile
+from typing import IO, Iterable, Optional, Tuple
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader, NodeStatement, EdgeStatement
+from yarspglib.yarspg_index import YARSpgIndex
+
+
+class EdgeFilter:
+    """
+    Selects edges by predicate IRI, edge label, target node label and seed node ids.
+
+    Every criterion left as None accepts all edges; the given ones must all
+    hold. An edge matches the seed set when its source or its target is a seed.
+    """
+
+    def __init__(self, predicates: Optional[Iterable[str]] = None, labels: Optional[Iterable[str]] = None,
+                 target_labels: Optional[Iterable[str]] = None, seeds: Optional[Iterable[str]] = None):
+        self.predicates = set(predicates) if predicates else None
+        self.labels = set(labels) if labels else None
+        self.target_labels = set(target_labels) if target_labels else None
+        self.seeds = set(seeds) if seeds else None
+        self.target_nodes = None
+
+    def matches_ids(self, source: str, target: str) -> bool:
+        if self.seeds is not None and source not in self.seeds and target not in self.seeds:
+            return False
+        return self.target_nodes is None or target in self.target_nodes
+
+    def matches(self, edge: EdgeStatement) -> bool:
+        if not self.matches_ids(edge.source, edge.target):
+            return False
+        if self.labels is not None and not self.labels.intersection(edge.labels):
+            return False
+        return self.predicates is None or edge.props.get('@value') in self.predicates
+
+    @property
+    def needs_props(self) -> bool:
+        return self.predicates is not None or self.labels is not None
+
+
+class SubgraphExtractor:
+    """
+    Streams a YARS-PG file and extracts the edges accepted by an `EdgeFilter`
+    together with the node statements they reference.
+
+    Matching edge lines are spooled to a temporary file while their endpoint
+    ids are collected, so memory grows with the size of the result rather than
+    of the input. Node statements are then read back through the sidecar index
+    when a current one exists, which keeps the extraction to a single pass;
+    otherwise the file is streamed a second time. A target label filter needs
+    the node labels before the edges are read and adds one more pass over the
+    node statements.
+    """
+
+    def __init__(self, yarspg_file: str, edge_filter: EdgeFilter, index_path: Optional[str] = None):
+        self.yarspg_file = yarspg_file
+        self.edge_filter = edge_filter
+        self.index_path = index_path
+        self.metadata = []
+        self.passes = 0
+
+    def _collect_target_nodes(self) -> None:
+        target_nodes = set()
+        with open(self.yarspg_file, "rb") as f:
+            reader = YARSpgStatementReader(f)
+            for offset, text in reader.lines():
+                match = reader.NODE_PATTERN.match(text)
+                if match:
+                    labels = reader.decode_labels(match.group(2))
+                    if reader.prefixes and len(labels) > 1:
+                        labels = reader.expand_labels(labels)
+                    if self.edge_filter.target_labels.intersection(labels):
+                        target_nodes.add(match.group(1))
+                    continue
+                if reader.EDGE_PATTERN.match(text):
+                    continue
+                for statement in reader.read_line(text, offset):
+                    if isinstance(statement, NodeStatement) \
+                            and self.edge_filter.target_labels.intersection(statement.labels):
+                        target_nodes.add(statement.id)
+        self.edge_filter.target_nodes = target_nodes
+        self.passes += 1
+
+    def _collect_edges(self, spool: IO[bytes]) -> Tuple[set, int]:
+        edge_filter = self.edge_filter
+        node_ids = set(edge_filter.seeds or ())
+        edge_count = 0
+        with open(self.yarspg_file, "rb") as f:
+            reader = YARSpgStatementReader(f)
+            for offset, text in reader.lines():
+                match = reader.EDGE_PATTERN.match(text)
+                if match:
+                    if not edge_filter.matches_ids(match.group(1), match.group(4)):
+                        continue
+                    if not edge_filter.needs_props:
+                        spool.write(text.encode("utf-8") + b"\n")
+                        node_ids.update((match.group(1), match.group(4)))
+                        edge_count += 1
+                        continue
+                elif reader.NODE_PATTERN.match(text):
+                    continue
+                elif text.startswith('+') or text.startswith('S('):
+                    self.metadata.append(text)
+                kept = text.startswith('$')
+                for statement in reader.read_line(text, offset):
+                    if isinstance(statement, EdgeStatement) and edge_filter.matches(statement):
+                        node_ids.update((statement.source, statement.target))
+                        edge_count += 1
+                        kept = True
+                if kept:
+                    spool.write(text.encode("utf-8") + b"\n")
+        self.passes += 1
+        return node_ids, edge_count
+
+    def _node_lines(self, node_ids: set) -> Iterable[str]:
+        if YARSpgIndex.is_current(self.yarspg_file, self.index_path):
+            index = YARSpgIndex(self.yarspg_file, self.index_path)
+            offsets = sorted(offset for offset in (index.find(node_id) for node_id in node_ids)
+                             if offset is not None and offset[0] >= 0)
+            with open(self.yarspg_file, "rb") as f:
+                for offset, _ in offsets:
+                    f.seek(offset)
+                    yield f.readline().decode("utf-8").strip()
+            return
+        self.passes += 1
+        with open(self.yarspg_file, "rb") as f:
+            reader = YARSpgStatementReader(f)
+            for offset, text in reader.lines():
+                match = reader.NODE_PATTERN.match(text)
+                if match:
+                    if match.group(1) in node_ids:
+                        yield text
+                elif not reader.EDGE_PATTERN.match(text) and any(
+                        isinstance(statement, NodeStatement) and statement.id in node_ids
+                        for statement in reader.read_line(text, offset)):
+                    yield text
+
+    def extract(self) -> Iterable[Tuple[str, str]]:
+        """
+        Yield `('metadata', line)` for the metadata and schema statements,
+        `('node', line)` for the referenced node statements, then
+        `('variable', line)` for the variable declarations and `('edge', line)`
+        for the matching edge lines, in file order.
+        """
+        if self.edge_filter.target_labels is not None:
+            self._collect_target_nodes()
+        with tempfile.TemporaryFile() as spool:
+            node_ids, _ = self._collect_edges(spool)
+            for line in self.metadata:
+                yield 'metadata', line
+            for line in self._node_lines(node_ids):
+                yield 'node', line
+            spool.seek(0)
+            for line in spool:
+                line = line.decode("utf-8").rstrip("\n")
+                yield 'variable' if line.startswith('$') else 'edge', line
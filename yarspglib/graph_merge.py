@@ -0,0 +1,180 @@
+import os
+import re
+from typing import IO, Iterable, Iterator, Optional
+from yarspglib.disk_dict import DiskBackedDict
+from yarspglib.node_dictionary import NodeDictionary
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer
+
+
+EDGE_ID_PATTERN = re.compile(r'\(\w+\)-\((\w+)\s')
+# Bytes of the shortest node statement, e.g. `(s1 {"IRI"} ["@value": ""])`,
+# bounding the number of nodes a file can hold.
+MIN_NODE_BYTES = 28
+
+
+def node_keys(reader: YARSpgStatementReader) -> Iterator[str]:
+    for _, text in reader.lines():
+        node = reader.NODE_PATTERN.match(text)
+        if node:
+            yield text[node.end(1):]
+
+
+class YARSpgMerger:
+    """
+    Merges YARS-PG files from separate serializer runs into one file.
+
+    Nodes are deduplicated by their term (type, value, datatype and language):
+    the first file defining a term keeps its statement, which is rewritten with
+    a fresh `s<n>`/`o<n>` id, and later files reuse that id. Edges are rewritten
+    through the id map of their own file. Each input is streamed into its own
+    `# Nodes`/`# Edges` segment of the output, and both the term dictionary and
+    the per-file id maps move to disk once they exceed `max_memory_items`.
+    When the inputs are large enough to hold that many nodes, their distinct
+    nodes are first estimated with `YARSpgSerializer.node_sketch`, and the
+    dictionaries expected to outgrow memory start on disk instead of filling
+    memory and spilling midway.
+    Variable declarations are copied once into the edge segment of the first
+    file declaring them; a name declared with different values is an error.
+    Metadata statements are copied as they are, and a namespace prefix bound
+    to different IRIs in two inputs is an error as well. A duplicate node that
+    carries type labels or folded literal properties is kept under the
+    existing id, so its labels and properties are not lost. Edge ids of
+    collapsed reifications are renumbered `r<n>` across all inputs. Schema
+    statements are copied once.
+    """
+
+    def __init__(self, output: IO[bytes], max_memory_items: int = 1000000, temp_dir: Optional[str] = None):
+        self.output = output
+        self.max_memory_items = max_memory_items
+        self.temp_dir = temp_dir
+        self.terms = DiskBackedDict(max_memory_items, temp_dir=temp_dir)
+        self.variables = {}
+        self.prefixes = {}
+        self.schemas = set()
+        self.subject_counter = 1
+        self.object_counter = 1
+        self.edge_id_counter = 1
+        self.node_count = 0
+        self.edge_count = 0
+        self.duplicate_count = 0
+        self.node_estimates = {}
+
+    def _new_id(self, old_id: str) -> str:
+        if old_id.startswith('s'):
+            node_id = f"s{self.subject_counter}"
+            self.subject_counter += 1
+        else:
+            node_id = f"o{self.object_counter}"
+            self.object_counter += 1
+        return node_id
+
+    def estimate_nodes(self, yarspg_files: Iterable[str]) -> int:
+        """
+        Estimate the distinct nodes of each file and of all files together,
+        keyed by the node statement without its id. Files too small to hold
+        `max_memory_items` nodes together are not read.
+        """
+        yarspg_files = list(yarspg_files)
+        if sum(os.path.getsize(f) for f in yarspg_files) < self.max_memory_items * MIN_NODE_BYTES:
+            return 0
+        total = None
+        for yarspg_file in yarspg_files:
+            with open(yarspg_file, "rb") as f:
+                reader = YARSpgStatementReader(f)
+                sketch = YARSpgSerializer.node_sketch(node_keys(reader))
+            self.node_estimates[yarspg_file] = sketch.estimate()
+            if total is None:
+                total = sketch
+            else:
+                total.merge(sketch)
+        return total.estimate()
+
+    def add_file(self, yarspg_file: str) -> None:
+        ids = DiskBackedDict(self.max_memory_items, temp_dir=self.temp_dir)
+        if self.node_estimates.get(yarspg_file, 0) >= self.max_memory_items:
+            ids.spill()
+        section = None
+        lines = []
+        try:
+            with open(yarspg_file, "rb") as f:
+                reader = YARSpgStatementReader(f)
+                for offset, text in reader.lines():
+                    node = reader.NODE_PATTERN.match(text)
+                    edge = None if node else reader.EDGE_PATTERN.match(text)
+                    variable = None if node or edge else reader.VARIABLE_PATTERN.match(text)
+                    if text.startswith('+'):
+                        list(reader.read_line(text, offset))
+                        for name, namespace in reader.prefixes.items():
+                            if self.prefixes.setdefault(name, namespace) != namespace:
+                                raise ValueError(f"Prefix {name} in {yarspg_file} conflicts with an earlier declaration")
+                        lines.append(text + "\n")
+                        continue
+                    elif text.startswith('S('):
+                        if text not in self.schemas:
+                            self.schemas.add(text)
+                            lines.append(text + "\n")
+                        continue
+                    elif variable:
+                        list(reader.read_line(text, offset))
+                        name = variable.group(1)
+                        if name in self.variables:
+                            if self.variables[name] != reader.variables[name]:
+                                raise ValueError(f"Variable ${name} in {yarspg_file} conflicts with an earlier declaration")
+                            continue
+                        self.variables[name] = reader.variables[name]
+                        line = text
+                        kind = 'edge'
+                    elif node is None and edge is None:
+                        raise ValueError(f"Cannot merge statement at byte {offset} of {yarspg_file}: {text}")
+                    elif node:
+                        statement = next(reader.read_line(text, offset), None)
+                        if statement is None:
+                            continue
+                        key = NodeDictionary.statement_key(statement)
+                        node_id = self.terms.get(key)
+                        if node_id is not None:
+                            ids[statement.id] = node_id
+                            self.duplicate_count += 1
+                            if len(statement.labels) == 1 and all(prop.startswith('@') for prop in statement.props):
+                                continue
+                        else:
+                            node_id = self._new_id(statement.id)
+                            self.terms[key] = node_id
+                            ids[statement.id] = node_id
+                            self.node_count += 1
+                        line = text[:node.start(1)] + node_id + text[node.end(1):]
+                        kind = 'node'
+                    else:
+                        source, target = ids.get(edge.group(1)), ids.get(edge.group(4))
+                        if source is None or target is None:
+                            missing = edge.group(1) if source is None else edge.group(4)
+                            raise ValueError(f"Edge references undefined node {missing} in {yarspg_file}")
+                        line = (text[:edge.start(1)] + source + text[edge.end(1):edge.start(4)] + target
+                                + text[edge.end(4):])
+                        edge_id = EDGE_ID_PATTERN.match(line)
+                        if edge_id:
+                            line = line[:edge_id.start(1)] + f"r{self.edge_id_counter}" + line[edge_id.end(1):]
+                            self.edge_id_counter += 1
+                        self.edge_count += 1
+                        kind = 'edge'
+                    if kind != section:
+                        lines.append("# Nodes\n" if kind == 'node' else "# Edges\n")
+                        section = kind
+                    lines.append(line + "\n")
+                    if len(lines) >= 10000:
+                        self.output.write("".join(lines).encode("utf-8"))
+                        lines = []
+            self.output.write("".join(lines).encode("utf-8"))
+        finally:
+            ids.close()
+
+    def merge(self, yarspg_files: Iterable[str]) -> None:
+        yarspg_files = list(yarspg_files)
+        if self.estimate_nodes(yarspg_files) >= self.max_memory_items:
+            self.terms.spill()
+        for yarspg_file in yarspg_files:
+            self.add_file(yarspg_file)
+
+    def close(self) -> None:
+        self.terms.close()
@@ -0,0 +1,290 @@
+import re
+from array import array
+from collections import Counter
+from typing import Optional
+import numpy as np
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader, NodeStatement, EdgeStatement
+from yarspglib.serializer.NTriplesTokenizer import tokenize_line, literal_annotation, XSD_STRING, RDF_LANG_STRING
+from yarspglib.sketches import HyperLogLog, CountMinSketch, hash_values
+
+
+class GraphStatistics:
+    """
+    Accumulates graph statistics from a stream of nodes and edges.
+
+    Nodes get integer codes. With `serializer_ids`, ids in the serializer's
+    `s<n>`/`o<n>` form map to codes arithmetically and need no dictionary entry
+    as long as `n` stays within `ARITHMETIC_SLACK` times the nodes seen so far
+    (or `ARITHMETIC_MIN_LIMIT`), which keeps the code arrays proportional to
+    the graph; any other key goes through a dictionary. Edges are buffered as code triples
+    and folded into NumPy degree, predicate and literal histograms every
+    `chunk_size` edges, so per-edge Python work stays minimal.
+    """
+
+    SERIALIZER_ID = re.compile(r'([so])([0-9]+)$')
+    ARITHMETIC_SLACK = 4
+    ARITHMETIC_MIN_LIMIT = 1 << 16
+
+    def __init__(self, top_k: int = 10, chunk_size: int = 100000, serializer_ids: bool = True):
+        self.top_k = top_k
+        self.serializer_ids = serializer_ids
+        self.chunk_size = chunk_size
+        self.node_codes = {}
+        self.node_count = 0
+        self.edge_count = 0
+        self.predicate_codes = {}
+        self.annotation_codes = {}
+        self.out_degree = np.zeros(0, dtype=np.int64)
+        self.in_degree = np.zeros(0, dtype=np.int64)
+        self.node_seen = np.zeros(0, dtype=bool)
+        self.node_annotation = np.zeros(0, dtype=np.int32)
+        self.predicate_counts = np.zeros(0, dtype=np.int64)
+        self.annotation_counts = np.zeros(0, dtype=np.int64)
+        self._edges = array('q')
+
+    @staticmethod
+    def _grow(values: np.ndarray, size: int, fill=0) -> np.ndarray:
+        if size <= len(values):
+            return values
+        grown = np.full(max(size, 2 * len(values)), fill, dtype=values.dtype)
+        grown[:len(values)] = values
+        return grown
+
+    def node_code(self, key: str) -> int:
+        code = self.node_codes.get(key) if self.node_codes else None
+        if code is None and self.serializer_ids:
+            match = self.SERIALIZER_ID.match(key)
+            if match:
+                number = int(match.group(2))
+                if number <= max(self.ARITHMETIC_SLACK * self.node_count, self.ARITHMETIC_MIN_LIMIT):
+                    return 3 * number + (match.group(1) == 'o')
+        if code is None:
+            code = len(self.node_codes)
+            self.node_codes[key] = code
+        return 3 * code + 2 if self.serializer_ids else code
+
+    def add_node(self, key: str, literal: bool = False, datatype: Optional[str] = None,
+                 lang: Optional[str] = None) -> int:
+        """
+        Register a node and, for literals, its datatype and language.
+        """
+        code = self.node_code(key)
+        self._ensure(code + 1)
+        if not self.node_seen[code]:
+            self.node_seen[code] = True
+            self.node_count += 1
+        if literal:
+            annotation = (datatype or (RDF_LANG_STRING if lang else XSD_STRING), lang)
+            annotation_code = self.annotation_codes.setdefault(annotation, len(self.annotation_codes))
+            self.node_annotation[code] = annotation_code
+        return code
+
+    def _ensure(self, size: int) -> None:
+        self.out_degree = self._grow(self.out_degree, size)
+        self.in_degree = self._grow(self.in_degree, size)
+        self.node_seen = self._grow(self.node_seen, size, False)
+        self.node_annotation = self._grow(self.node_annotation, size, -1)
+
+    def add_edge(self, source: int, predicate: str, target: int) -> None:
+        predicate_code = self.predicate_codes.setdefault(predicate, len(self.predicate_codes))
+        self._edges.extend((source, predicate_code, target))
+        if len(self._edges) >= 3 * self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Fold buffered edges into the histograms.
+        """
+        if not self._edges:
+            return
+        edges = np.frombuffer(self._edges, dtype=np.int64).reshape(-1, 3)
+        size = len(self.node_seen)
+        self.out_degree[:size] += np.bincount(edges[:, 0], minlength=size)[:size]
+        self.in_degree[:size] += np.bincount(edges[:, 2], minlength=size)[:size]
+        self.predicate_counts = self._grow(self.predicate_counts, len(self.predicate_codes))
+        self.predicate_counts[:len(self.predicate_codes)] += np.bincount(
+            edges[:, 1], minlength=len(self.predicate_codes))
+        annotations = self.node_annotation[edges[:, 2]]
+        annotations = annotations[annotations >= 0]
+        self.annotation_counts = self._grow(self.annotation_counts, len(self.annotation_codes))
+        self.annotation_counts[:len(self.annotation_codes)] += np.bincount(
+            annotations, minlength=len(self.annotation_codes))
+        self.edge_count += len(edges)
+        self._edges = array('q')
+
+    @staticmethod
+    def _distribution(degrees: np.ndarray) -> dict:
+        if len(degrees) == 0:
+            return {'min': 0, 'max': 0, 'mean': 0.0, 'median': 0.0, 'histogram': {}}
+        histogram = np.bincount(degrees)
+        values = np.flatnonzero(histogram)
+        return {
+            'min': int(degrees.min()),
+            'max': int(degrees.max()),
+            'mean': float(degrees.mean()),
+            'median': float(np.median(degrees)),
+            'histogram': {str(value): int(histogram[value]) for value in values},
+        }
+
+    def result(self) -> dict:
+        self.flush()
+        seen = self.node_seen
+        out_degree = self.out_degree[seen]
+        in_degree = self.in_degree[seen]
+        predicates = list(self.predicate_codes)
+        counts = self.predicate_counts[:len(predicates)]
+        top = np.argsort(-counts, kind='stable')[:self.top_k]
+        datatypes, languages = Counter(), Counter()
+        for (datatype, lang), code in self.annotation_codes.items():
+            count = int(self.annotation_counts[code]) if code < len(self.annotation_counts) else 0
+            if count:
+                datatypes[datatype] += count
+                if lang:
+                    languages[lang] += count
+        return {
+            'nodes': self.node_count,
+            'edges': self.edge_count,
+            'distinct_subjects': int(np.count_nonzero(out_degree)),
+            'distinct_objects': int(np.count_nonzero(in_degree)),
+            'distinct_predicates': len(predicates),
+            'out_degree': self._distribution(out_degree),
+            'in_degree': self._distribution(in_degree),
+            'top_predicates': [[predicates[code], int(counts[code])] for code in top.tolist()],
+            'datatypes': dict(datatypes.most_common()),
+            'languages': dict(languages.most_common()),
+        }
+
+
+class SketchStatistics:
+    """
+    Approximate graph statistics in memory independent of the graph size.
+
+    Distinct node, subject and object counts come from HyperLogLog sketches,
+    and the highest-degree subjects and objects from count-min sketches with
+    a small candidate set per direction. Degree distributions need a counter
+    per node and are not reported. Predicate and literal annotation counts,
+    and with them the distinct predicate count, stay exact, as their number is
+    small in practice; for YARS-PG input literals are counted per node
+    statement rather than per edge.
+    """
+
+    def __init__(self, top_k: int = 10, chunk_size: int = 100000, precision: int = 14):
+        self.top_k = top_k
+        self.chunk_size = chunk_size
+        self.edge_count = 0
+        self.nodes = HyperLogLog(precision)
+        self.subjects = HyperLogLog(precision)
+        self.objects = HyperLogLog(precision)
+        self.out_degree = CountMinSketch()
+        self.in_degree = CountMinSketch()
+        self.top_subjects = {}
+        self.top_objects = {}
+        self.predicate_counts = Counter()
+        self.annotation_counts = Counter()
+        self._nodes, self._sources, self._targets = [], [], []
+
+    def add_node(self, key: str, literal: bool = False, datatype: Optional[str] = None,
+                 lang: Optional[str] = None) -> str:
+        self._nodes.append(key)
+        if literal:
+            self.annotation_counts[(datatype or (RDF_LANG_STRING if lang else XSD_STRING), lang)] += 1
+        if len(self._nodes) >= self.chunk_size:
+            self.nodes.add(self._nodes)
+            self._nodes = []
+        return key
+
+    def add_edge(self, source: str, predicate: str, target: str) -> None:
+        self.predicate_counts[predicate] += 1
+        self._sources.append(source)
+        self._targets.append(target)
+        if len(self._sources) >= self.chunk_size:
+            self.flush()
+
+    def _update_top(self, sketch: CountMinSketch, top: dict, keys: list, hashes: np.ndarray) -> None:
+        sketch.add_hashes(hashes)
+        unique, first = np.unique(hashes, return_index=True)
+        candidates = {int(h): keys[i] for h, i in zip(unique.tolist(), first.tolist())}
+        estimates = sketch.estimate_hashes(unique)
+        for code in np.argsort(-estimates, kind='stable')[:self.top_k].tolist():
+            top[int(unique[code])] = candidates[int(unique[code])]
+        hashes = np.fromiter(top, dtype=np.uint64, count=len(top))
+        keep = np.argsort(-sketch.estimate_hashes(hashes), kind='stable')[:self.top_k]
+        kept = {int(hashes[i]) for i in keep.tolist()}
+        for code in list(top):
+            if code not in kept:
+                del top[code]
+
+    def flush(self) -> None:
+        if self._nodes:
+            self.nodes.add(self._nodes)
+            self._nodes = []
+        if not self._sources:
+            return
+        sources, targets = hash_values(self._sources), hash_values(self._targets)
+        self.subjects.add_hashes(sources)
+        self.objects.add_hashes(targets)
+        self._update_top(self.out_degree, self.top_subjects, self._sources, sources)
+        self._update_top(self.in_degree, self.top_objects, self._targets, targets)
+        self.edge_count += len(self._sources)
+        self._sources, self._targets = [], []
+
+    def _top(self, sketch: CountMinSketch, top: dict) -> list:
+        hashes = np.fromiter(top, dtype=np.uint64, count=len(top))
+        estimates = sketch.estimate_hashes(hashes)
+        order = np.argsort(-estimates, kind='stable')
+        return [[top[int(hashes[i])], int(estimates[i])] for i in order.tolist()]
+
+    def result(self) -> dict:
+        self.flush()
+        datatypes, languages = Counter(), Counter()
+        for (datatype, lang), count in self.annotation_counts.items():
+            datatypes[datatype] += count
+            if lang:
+                languages[lang] += count
+        return {
+            'approximate': True,
+            'nodes': self.nodes.estimate(),
+            'edges': self.edge_count,
+            'distinct_subjects': self.subjects.estimate(),
+            'distinct_objects': self.objects.estimate(),
+            'distinct_predicates': len(self.predicate_counts),
+            'top_subjects': self._top(self.out_degree, self.top_subjects),
+            'top_objects': self._top(self.in_degree, self.top_objects),
+            'top_predicates': [[p, count] for p, count in self.predicate_counts.most_common(self.top_k)],
+            'datatypes': dict(datatypes.most_common()),
+            'languages': dict(languages.most_common()),
+        }
+
+
+def yarspg_statistics(stream, top_k: int = 10, approximate: bool = False) -> dict:
+    """
+    Compute statistics of a YARS-PG file opened in binary mode.
+    """
+    stats = SketchStatistics(top_k) if approximate else GraphStatistics(top_k)
+    for statement in YARSpgStatementReader(stream):
+        if isinstance(statement, NodeStatement):
+            stats.add_node(statement.id, statement.labels[0] == 'Literal',
+                           statement.props.get('@datatype'), statement.props.get('@lang'))
+        elif isinstance(statement, EdgeStatement):
+            stats.add_edge(stats.add_node(statement.source), statement.props.get('@value'),
+                           stats.add_node(statement.target))
+    return stats.result()
+
+
+def ntriples_statistics(stream, top_k: int = 10, approximate: bool = False) -> dict:
+    """
+    Compute statistics of an N-Triples file opened in binary mode.
+    """
+    stats = SketchStatistics(top_k) if approximate else GraphStatistics(top_k, serializer_ids=False)
+    for line in stream:
+        triple = tokenize_line(line.decode("utf-8"))
+        if triple is None:
+            continue
+        subject, predicate, obj = triple
+        if obj.startswith('"'):
+            datatype, lang = literal_annotation(obj)
+            target = stats.add_node(obj, True, datatype, lang)
+        else:
+            target = stats.add_node(obj)
+        stats.add_edge(stats.add_node(subject), predicate[1:-1], target)
+    return stats.result()
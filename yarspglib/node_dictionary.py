@@ -0,0 +1,187 @@
+import json
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader, NodeStatement
+from yarspglib.sketches import hash64
+
+
+class NodeDictionary:
+    """
+    Memory-mapped sidecar dictionary from node terms to the node ids of a YARS-PG file.
+
+    Terms are keyed by their type, value, datatype and language as written in
+    the node statement and stored as sorted 64-bit key hashes next to the byte
+    offset of the statement. A lookup binary-searches the hashes and confirms
+    the match by decoding the statement line, so hash collisions are harmless.
+    The dictionary lives in a directory next to the file (`FILE.ydict` by
+    default) as a list of segments: appending a delta adds one small segment,
+    and segments are merged once there are more than `MAX_SEGMENTS`. The meta
+    file also keeps the next subject and object counters and the namespace
+    prefixes of the file.
+    """
+
+    MAX_SEGMENTS = 8
+
+    def __init__(self, yarspg_file: str, path: Optional[str] = None):
+        self.yarspg_file = yarspg_file
+        self.path = path or f"{yarspg_file}.ydict"
+        with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.subject_counter = self.meta['subject_counter']
+        self.object_counter = self.meta['object_counter']
+        self.segments = self._load_segments(self.meta['segments'])
+        self._file = None
+        self._reader = YARSpgStatementReader(None)
+        self._reader.prefixes = self.meta.get('prefixes', {})
+
+    def _load_segments(self, names: list) -> list:
+        return [(np.load(os.path.join(self.path, f"{name}.hashes.npy"), mmap_mode='r'),
+                 np.load(os.path.join(self.path, f"{name}.offsets.npy"), mmap_mode='r')) for name in names]
+
+    @staticmethod
+    def node_key(node_type: str, value: str, datatype: Optional[str] = None, lang: Optional[str] = None) -> str:
+        return "\x1f".join((node_type, value, datatype or "", lang or ""))
+
+    @classmethod
+    def statement_key(cls, statement: NodeStatement) -> str:
+        props = statement.props
+        return cls.node_key(statement.labels[0] if statement.labels else "", str(props.get('@value', "")),
+                            props.get('@datatype'), props.get('@lang'))
+
+    @staticmethod
+    def _file_stamp(yarspg_file: str) -> dict:
+        stat = os.stat(yarspg_file)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    @classmethod
+    def open(cls, yarspg_file: str, path: Optional[str] = None) -> "NodeDictionary":
+        """
+        Open the dictionary of a YARS-PG file, building it first if it is missing or stale.
+        """
+        path = path or f"{yarspg_file}.ydict"
+        meta_file = os.path.join(path, "meta.json")
+        if os.path.isfile(meta_file):
+            with open(meta_file, "r", encoding="utf-8") as f:
+                if json.load(f).get('file') == cls._file_stamp(yarspg_file):
+                    return cls(yarspg_file, path)
+        cls.build(yarspg_file, path)
+        return cls(yarspg_file, path)
+
+    @staticmethod
+    def _scan(yarspg_file: str, start: int = 0,
+              prefixes: Optional[dict] = None) -> Tuple[List[int], List[int], int, int, dict]:
+        hashes, offsets = [], []
+        counters = {'s': 0, 'o': 0}
+        with open(yarspg_file, "rb") as f:
+            f.seek(start)
+            reader = YARSpgStatementReader(f)
+            reader.prefixes = dict(prefixes or {})
+            for offset, text in reader.lines():
+                if reader.EDGE_PATTERN.match(text):
+                    continue
+                for statement in reader.read_line(text, offset):
+                    if not isinstance(statement, NodeStatement):
+                        continue
+                    hashes.append(hash64(NodeDictionary.statement_key(statement)))
+                    offsets.append(statement.offset)
+                    prefix, number = statement.id[:1], statement.id[1:]
+                    if prefix in counters and number.isdigit():
+                        counters[prefix] = max(counters[prefix], int(number))
+        return hashes, offsets, counters['s'] + 1, counters['o'] + 1, reader.prefixes
+
+    @staticmethod
+    def _save_segment(path: str, name: str, hashes, offsets) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        order = np.argsort(hashes, kind='stable')
+        np.save(os.path.join(path, f"{name}.hashes.npy"), hashes[order])
+        np.save(os.path.join(path, f"{name}.offsets.npy"), offsets[order])
+
+    @classmethod
+    def build(cls, yarspg_file: str, path: Optional[str] = None) -> None:
+        """
+        Scan the node statements of a YARS-PG file and write its dictionary as a single segment.
+        """
+        path = path or f"{yarspg_file}.ydict"
+        hashes, offsets, subject_counter, object_counter, prefixes = cls._scan(yarspg_file)
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.endswith(".npy"):
+                os.remove(os.path.join(path, name))
+        cls._save_segment(path, "segment0", hashes, offsets)
+        cls._write_meta(path, yarspg_file, ["segment0"], subject_counter, object_counter, prefixes)
+
+    @classmethod
+    def _write_meta(cls, path: str, yarspg_file: str, segments: list, subject_counter: int,
+                    object_counter: int, prefixes: dict) -> None:
+        meta = {
+            'file': cls._file_stamp(yarspg_file),
+            'segments': segments,
+            'subject_counter': subject_counter,
+            'object_counter': object_counter,
+            'prefixes': prefixes,
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _statement(self, offset: int) -> NodeStatement:
+        if self._file is None:
+            self._file = open(self.yarspg_file, "rb")
+        self._file.seek(offset)
+        line = self._file.readline().decode("utf-8").strip()
+        return next(s for s in self._reader.read_line(line, offset) if isinstance(s, NodeStatement))
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the node id stored for a node key, or None.
+        """
+        code = np.uint64(hash64(key))
+        for hashes, offsets in self.segments:
+            lo = int(np.searchsorted(hashes, code, 'left'))
+            hi = int(np.searchsorted(hashes, code, 'right'))
+            for offset in offsets[lo:hi].tolist():
+                statement = self._statement(offset)
+                if self.statement_key(statement) == key:
+                    return statement.id
+        return None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def add_segment(self, start: int) -> None:
+        """
+        Index the node statements appended to the file from byte offset `start` on
+        and record the file's new size and modification time.
+        """
+        self.close()
+        hashes, offsets, subject_counter, object_counter, prefixes = self._scan(self.yarspg_file, start,
+                                                                                self._reader.prefixes)
+        segments = list(self.meta['segments'])
+        name = self._next_segment(segments)
+        self._save_segment(self.path, name, hashes, offsets)
+        segments.append(name)
+        if len(segments) > self.MAX_SEGMENTS:
+            segments = self._compact(segments)
+        self.subject_counter = max(self.subject_counter, subject_counter)
+        self.object_counter = max(self.object_counter, object_counter)
+        self._write_meta(self.path, self.yarspg_file, segments, self.subject_counter, self.object_counter, prefixes)
+        self._reader.prefixes = prefixes
+        self.meta['segments'] = segments
+        self.segments = self._load_segments(segments)
+
+    @staticmethod
+    def _next_segment(segments: list) -> str:
+        return f"segment{int(segments[-1][len('segment'):]) + 1}" if segments else "segment0"
+
+    def _compact(self, segments: list) -> list:
+        hashes = np.concatenate([np.load(os.path.join(self.path, f"{name}.hashes.npy")) for name in segments])
+        offsets = np.concatenate([np.load(os.path.join(self.path, f"{name}.offsets.npy")) for name in segments])
+        name = self._next_segment(segments)
+        self._save_segment(self.path, name, hashes, offsets)
+        for old in segments:
+            os.remove(os.path.join(self.path, f"{old}.hashes.npy"))
+            os.remove(os.path.join(self.path, f"{old}.offsets.npy"))
+        return [name]
@@ -0,0 +1,186 @@
+import re
+from collections import Counter
+from typing import IO, Optional
+from rdflib import URIRef, Literal, BNode
+from rdflib.namespace import RDF, RDFS, XSD, OWL
+from rdflib.plugins.serializers.nt import _nt_row, _quote_encode
+
+
+class NTriplesStreamWriter:
+    """
+    Writes triples as N-Triples lines straight to a binary stream.
+
+    It exposes the same `add` method as an rdflib Graph, so it can be handed to
+    `YARSpgHandler` in place of a graph. Rows are rendered exactly like the rdflib
+    `nt` serializer and written in chunks of `buffer_size` lines. Triples in the
+    default graph are also valid N-Quads, so the same writer serves `nq` output.
+    Unlike a Graph, the writer does not deduplicate triples.
+    """
+
+    def __init__(self, stream: IO[bytes], buffer_size: int = 10000):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self._rows = []
+        self.count = 0
+
+    def add(self, triple) -> None:
+        self._rows.append(_nt_row(triple))
+        if len(self._rows) >= self.buffer_size:
+            self.flush()
+
+    def addN(self, quads) -> None:
+        self._rows.extend(_nt_row((s, p, o)) for s, p, o, _ in quads)
+        if len(self._rows) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered rows to the output stream.
+        """
+        if self._rows:
+            self.stream.write("".join(self._rows).encode("utf-8"))
+            self.count += len(self._rows)
+            self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+class TurtleStreamWriter:
+    """
+    Writes triples as Turtle straight to a binary stream.
+
+    Consecutive triples with the same subject are grouped with `;` and repeated
+    predicates with `,`. Prefixes are learned from the first `sample_size`
+    triples, which are the only ones held back before output starts; IRIs outside
+    the learned namespaces are written in full. A subject that reappears later
+    starts a new statement, which is still valid Turtle.
+    """
+
+    KNOWN_PREFIXES = {str(RDF): 'rdf', str(RDFS): 'rdfs', str(XSD): 'xsd', str(OWL): 'owl'}
+    LOCAL_NAME = re.compile(r"^[A-Za-z0-9_](?:[A-Za-z0-9_.\-]*[A-Za-z0-9_\-])?$")
+
+    def __init__(self, stream: IO[bytes], sample_size: int = 1000, buffer_size: int = 10000):
+        self.stream = stream
+        self.sample_size = sample_size
+        self.buffer_size = buffer_size
+        self.prefixes = None
+        self._sample = []
+        self._chunks = []
+        self._subject = None
+        self._predicate = None
+        self.count = 0
+
+    def add(self, triple) -> None:
+        if self.prefixes is None:
+            self._sample.append(triple)
+            if len(self._sample) >= self.sample_size:
+                self._start()
+            return
+        self._write_triple(triple)
+        if len(self._chunks) >= self.buffer_size:
+            self.flush()
+
+    def addN(self, quads) -> None:
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+
+    def flush(self) -> None:
+        """
+        Write buffered Turtle text to the output stream.
+        """
+        if self._chunks:
+            self.stream.write("".join(self._chunks).encode("utf-8"))
+            self._chunks = []
+
+    def close(self) -> None:
+        """
+        Terminate the last statement and flush the output.
+        """
+        if self.prefixes is None:
+            self._start()
+        if self._subject is not None:
+            self._chunks.append(" .\n")
+            self._subject = None
+        self.flush()
+
+    def _start(self) -> None:
+        self.prefixes = self._learn_prefixes(self._sample)
+        for namespace, prefix in self.prefixes.items():
+            self._chunks.append(f"@prefix {prefix}: <{namespace}> .\n")
+        if self.prefixes:
+            self._chunks.append("\n")
+        sample, self._sample = self._sample, []
+        for triple in sample:
+            self._write_triple(triple)
+
+    def _learn_prefixes(self, triples) -> dict:
+        counter = Counter()
+        for triple in triples:
+            for term in triple:
+                if isinstance(term, Literal):
+                    term = term.datatype
+                if isinstance(term, URIRef):
+                    namespace = self._split_iri(term)[0]
+                    if namespace:
+                        counter[namespace] += 1
+        prefixes = {}
+        for namespace, _ in counter.most_common():
+            prefixes[namespace] = self.KNOWN_PREFIXES.get(namespace, f"ns{len(prefixes) + 1}")
+        return prefixes
+
+    def _split_iri(self, iri: str):
+        index = max(iri.rfind('#'), iri.rfind('/'))
+        if index < 0:
+            return None, iri
+        return iri[:index + 1], iri[index + 1:]
+
+    def _write_triple(self, triple) -> None:
+        subject, predicate, obj = triple
+        if subject == self._subject:
+            if predicate == self._predicate:
+                self._chunks.append(f" ,\n        {self._term(obj)}")
+            else:
+                self._chunks.append(f" ;\n    {self._predicate_term(predicate)} {self._term(obj)}")
+        else:
+            if self._subject is not None:
+                self._chunks.append(" .\n\n")
+            self._chunks.append(f"{self._term(subject)}\n    {self._predicate_term(predicate)} {self._term(obj)}")
+        self._subject = subject
+        self._predicate = predicate
+        self.count += 1
+
+    def _predicate_term(self, predicate) -> str:
+        if predicate == RDF.type:
+            return "a"
+        return self._term(predicate)
+
+    def _term(self, term) -> str:
+        if isinstance(term, Literal):
+            encoded = _quote_encode(term)
+            if term.language:
+                return f"{encoded}@{term.language}"
+            if term.datatype:
+                return f"{encoded}^^{self._iri(term.datatype)}"
+            return encoded
+        if isinstance(term, BNode):
+            return term.n3()
+        return self._iri(term)
+
+    def _iri(self, iri: str) -> str:
+        namespace, local = self._split_iri(iri)
+        prefix: Optional[str] = self.prefixes.get(namespace)
+        if prefix is not None and self.LOCAL_NAME.match(local):
+            return f"{prefix}:{local}"
+        return f"<{iri}>"
+
+
+STREAM_WRITERS = {
+    'nt': NTriplesStreamWriter,
+    'ntriples': NTriplesStreamWriter,
+    'nt11': NTriplesStreamWriter,
+    'nquads': NTriplesStreamWriter,
+    'nq': NTriplesStreamWriter,
+    'turtle': TurtleStreamWriter,
+    'ttl': TurtleStreamWriter,
+}
@@ -1,22 +1,34 @@
 import json
 import urllib.parse
 from antlr4.tree.Tree import TerminalNodeImpl
-from rdflib import URIRef, Literal
+from rdflib import URIRef, Literal, RDF
 from yarspglib.parser.YARSpgParser import YARSpgParser
+from yarspglib.parser.YARSpgStatementReader import NodeStatement, EdgeStatement, PREFIXES_KEY, expand_iri, \
+    expand_props, native_datatype
 
 
 class YARSpgHandler:
-    def __init__(self, graph):
+    def __init__(self, graph, batch_size=1, expand_reification=False, nodes=None):
         self.graph = graph
-        self.nodes = {}
+        self.expand_reification = expand_reification
+        self.nodes = nodes if nodes is not None else {}
+        self.variables = {}
+        self.prefixes = {}
+        self.batch_size = batch_size
+        self.triples = []
 
     def process_node(self, node):
         if isinstance(node, YARSpgParser.NodeContext):
             n_id = node.node_id().getText()
-            n_type = node.node_label()[0].getText().strip("\"")
-            n_props = node.prop_list().getText()
-            n_props = self.process_node_props(n_props)
-            self.nodes[n_id] = {'type': n_type, 'properties': n_props}
+            n_labels = [label.getText().strip("\"") for label in node.node_label()]
+            if node.prop_list().variable():
+                n_props = self.process_prop_list(node.prop_list())
+            else:
+                n_props = self.process_node_props(node.prop_list().getText())
+            if self.prefixes:
+                n_props = expand_props(n_props, self.prefixes, 'IRI' in n_labels)
+                n_labels[1:] = [expand_iri(label, self.prefixes) for label in n_labels[1:]]
+            self.add_node(n_id, n_labels, n_props)
 
     def process_edge(self, edge):
         if isinstance(edge, YARSpgParser.EdgeContext):
@@ -24,21 +36,136 @@ class YARSpgHandler:
                 sid = edge.directed().node_id()[0].getText()
                 oid = edge.directed().node_id()[1].getText()
                 e_label = edge.directed().edge_label()[0].getText()
-                e_props = edge.directed().prop_list().getText()
+                e_props = edge.directed().prop_list()
 
             if edge.undirected() is not None:
                 sid = edge.undirected().node_id()[0].getText()
                 oid = edge.undirected().node_id()[1].getText()
                 e_label = edge.undirected().edge_label()[0].getText()
-                e_props = edge.undirected().prop_list().getText()
+                e_props = edge.undirected().prop_list()
+
+            if e_props.variable():
+                props = self.process_prop_list(e_props)
+            else:
+                props = self.process_edge_props(e_props.getText())
+            if self.prefixes:
+                props = expand_props(props, self.prefixes, True)
+            if '@reifier' in props:
+                self.add_reified_edge(sid, oid, e_label.strip("\""), props)
+            else:
+                self.add_edge(sid, oid, e_label.strip("\""), props['@value'])
+
+    def process_variable_declaration(self, declaration):
+        name = declaration.variable().variable_name().getText()
+        self.variables[name] = json.loads("{" + ",".join(prop.getText() for prop in declaration.prop()) + "}",
+                                           strict=False)
+
+    def process_metadata(self, metadata):
+        prefixes = self.process_prop_list(metadata.prop_list()).get(PREFIXES_KEY)
+        if isinstance(prefixes, dict):
+            self.prefixes.update(prefixes)
 
-            predicate = self.process_edge_props(e_props)
-            if e_label.strip("\"") == 'IRI':
-                self.graph.add((self.match_type(sid), URIRef(self.encode_uri(predicate)),
-                                self.match_type(oid)))
+    def process_prop_list(self, prop_list):
+        props = {}
+        for child in prop_list.getChildren():
+            if isinstance(child, YARSpgParser.PropContext):
+                props.update(json.loads("{" + child.getText() + "}", strict=False))
+            elif isinstance(child, YARSpgParser.VariableContext):
+                name = child.variable_name().getText()
+                if name not in self.variables:
+                    raise ValueError(f"Undefined variable ${name}")
+                props.update(self.variables[name])
+        return props
+
+    def process_statement(self, statement):
+        if isinstance(statement, NodeStatement):
+            self.add_node(statement.id, statement.labels, statement.props)
+        elif isinstance(statement, EdgeStatement):
+            if '@reifier' in statement.props:
+                self.add_reified_edge(statement.source, statement.target, statement.labels[0], statement.props)
+            else:
+                self.add_edge(statement.source, statement.target, statement.labels[0], statement.props['@value'])
+
+    def add_node(self, n_id, n_labels, n_props):
+        datatype = native_datatype(n_labels) if len(n_labels) > 1 else None
+        if datatype is not None:
+            n_labels, n_props = n_labels[:1], {**n_props, '@datatype': datatype}
+        folded = [key for key in n_props if not key.startswith('@')]
+        if not folded and len(n_labels) == 1:
+            self.nodes[n_id] = {'type': n_labels[0], 'properties': n_props}
+            return
+        obj = {'type': n_labels[0], 'properties': {key: n_props[key] for key in n_props if key.startswith('@')}}
+        if n_id not in self.nodes or obj['properties']:
+            self.nodes[n_id] = obj
+        subject = self.node_term(self.nodes[n_id])
+        for label in n_labels[1:]:
+            self.add_triple((subject, RDF.type, URIRef(self.encode_uri(label))))
+        for key in folded:
+            predicate = URIRef(self.encode_uri(key))
+            for term in self.property_terms(n_props[key]):
+                self.add_triple((subject, predicate, term))
+
+    def property_terms(self, value):
+        """
+        Rebuild the terms of a folded property or edge annotation: a plain
+        string, a `{"@value", "@datatype"/"@lang"}` struct, an `{"@id"}`
+        struct or a list of those.
+        """
+        for item in value if isinstance(value, list) else [value]:
+            if not isinstance(item, dict):
+                yield Literal(item)
+            elif '@id' in item:
+                yield URIRef(self.encode_uri(item['@id']))
+            else:
+                yield Literal(item.get('@value'), datatype=item.get('@datatype'), lang=item.get('@lang'))
+
+    def add_reified_edge(self, sid, oid, e_label, props):
+        """
+        Add the triple of a collapsed reification unless it is marked as not
+        asserted, and with `expand_reification` also the reification statements
+        and the annotations of the reifier.
+        """
+        if props.get('@asserted') != 'false':
+            self.add_edge(sid, oid, e_label, props['@value'])
+        if not self.expand_reification:
+            return
+        reifier = URIRef(self.encode_uri(props['@reifier']))
+        self.add_triple((reifier, RDF.type, RDF.Statement))
+        self.add_triple((reifier, RDF.subject, self.match_type(sid)))
+        self.add_triple((reifier, RDF.predicate, URIRef(self.encode_uri(props['@value']))))
+        self.add_triple((reifier, RDF.object, self.match_type(oid)))
+        for key, value in props.items():
+            if not key.startswith('@'):
+                predicate = URIRef(self.encode_uri(key))
+                for term in self.property_terms(value):
+                    self.add_triple((reifier, predicate, term))
+
+    def add_edge(self, sid, oid, e_label, predicate):
+        if e_label == 'IRI':
+            self.add_triple((self.match_type(sid), URIRef(self.encode_uri(predicate)),
+                             self.match_type(oid)))
+
+    def add_triple(self, triple):
+        if self.batch_size <= 1:
+            self.graph.add(triple)
+            return
+        self.triples.append(triple)
+        if len(self.triples) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.triples:
+            graph = self.graph
+            graph.addN((s, p, o, graph) for s, p, o in self.triples)
+            self.triples = []
 
     def match_type(self, element_id):
         obj = self.nodes.get(element_id)
+        if obj:
+            return self.node_term(obj)
+        return None
+
+    def node_term(self, obj):
         if obj:
             properties = obj.get('properties', {})
             value = properties.get('@value')
@@ -56,9 +183,9 @@ class YARSpgHandler:
         return uri
 
     def process_node_props(self, props_data):
-        props_data = props_data.strip("[]")
+        props_data = props_data[1:-1] if props_data.startswith("[") else props_data
         try:
-            props_dict = json.loads("{" + props_data + "}")
+            props_dict = json.loads("{" + props_data + "}", strict=False)
         except json.JSONDecodeError as e:
             print(f"Properties decoding error: {e}")
             print(f"Invalid properties: {props_data}")
@@ -69,14 +196,21 @@ class YARSpgHandler:
         return props
 
     def process_edge_props(self, props_data):
-        props_data = props_data.strip("[]")
-        props_dict = json.loads("{" + props_data + "}")
-        return props_dict['@value']
+        props_data = props_data[1:-1] if props_data.startswith("[") else props_data
+        return json.loads("{" + props_data + "}", strict=False)
 
     def traverse_tree(self, tree):
         if isinstance(tree, TerminalNodeImpl):
             return
         for child in tree.getChildren():
+            if isinstance(child, YARSpgParser.Variable_declarationContext):
+                self.process_variable_declaration(child)
+                continue
+            if isinstance(child, YARSpgParser.MetadataContext):
+                self.process_metadata(child)
+                continue
+            if isinstance(child, YARSpgParser.Node_schemaContext):
+                continue
             if isinstance(child, YARSpgParser.NodeContext):
                 self.process_node(child)
             if isinstance(child, YARSpgParser.EdgeContext):
@@ -1,19 +1,52 @@
+import re
 from rdflib import Graph
 from yarspglib.parser.YARSpgHandler import YARSpgHandler
 from yarspglib.parser.YARSpgLexer import YARSpgLexer
 from yarspglib.parser.YARSpgParser import YARSpgParser
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader
 from antlr4 import *
 
+ESCAPE_PATTERN = re.compile(r'\\(u00[01][0-9A-Fa-f]|u007[Ff]|.)', re.DOTALL)
+
+
+def unescape_control_characters(data: str) -> str:
+    """
+    Replace the `\\u00XX` escapes of control characters by the raw characters.
+
+    The ANTLR lexer has no `\\u` escape but accepts raw control characters
+    other than line breaks inside strings, and the handler decodes them.
+    """
+    if '\\u' not in data:
+        return data
+
+    def unescape(match):
+        escape = match.group(1)
+        if len(escape) == 5 and escape[3:].lower() not in ('0a', '0d'):
+            return chr(int(escape[1:], 16))
+        return match.group(0)
+
+    return ESCAPE_PATTERN.sub(unescape, data)
+
 
 class YARSpgProcessor:
-    def __init__(self):
-        self.graph = Graph()
+    def __init__(self, graph=None, batch_size=1, expand_reification=False, nodes=None):
+        self.graph = graph if graph is not None else Graph()
+        self.batch_size = batch_size
+        self.expand_reification = expand_reification
+        self.nodes = nodes
 
     def process_YARSpg(self, data):
-        input_stream = InputStream(data)
+        input_stream = InputStream(unescape_control_characters(data))
         lexer = YARSpgLexer(input_stream)
         stream = CommonTokenStream(lexer)
         parser = YARSpgParser(stream)
         tree = parser.yarspg()
-        handler = YARSpgHandler(self.graph)
+        handler = YARSpgHandler(self.graph, self.batch_size, self.expand_reification, self.nodes)
         handler.traverse_tree(tree)
+        handler.flush()
+
+    def process_YARSpg_stream(self, stream):
+        handler = YARSpgHandler(self.graph, self.batch_size, self.expand_reification, self.nodes)
+        for statement in YARSpgStatementReader(stream):
+            handler.process_statement(statement)
+        handler.flush()
@@ -0,0 +1,272 @@
+import json
+import re
+from collections import namedtuple
+from typing import IO, Iterator, Optional, Tuple
+from antlr4 import InputStream, CommonTokenStream
+from yarspglib.parser.YARSpgLexer import YARSpgLexer
+from yarspglib.parser.YARSpgParser import YARSpgParser
+
+NodeStatement = namedtuple('NodeStatement', ['offset', 'id', 'labels', 'props'])
+EdgeStatement = namedtuple('EdgeStatement', ['offset', 'source', 'target', 'labels', 'props'])
+
+PREFIXES_KEY = '@prefixes'
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+NATIVE_TYPES = {'Integer': XSD + "integer", 'Decimal': XSD + "decimal", 'Float': XSD + "double",
+                'Bool': XSD + "boolean", 'Date': XSD + "date", 'DateTime': XSD + "dateTime"}
+
+
+def expand_iri(value: str, prefixes: dict) -> str:
+    """
+    Expand a compact `prefix:local` IRI whose prefix is in `prefixes`; any other value is returned unchanged.
+    """
+    name, separator, local = value.partition(':')
+    namespace = prefixes.get(name) if separator else None
+    return value if namespace is None else namespace + local
+
+
+def native_datatype(labels: list) -> Optional[str]:
+    """
+    The XSD datatype of a literal node written with a native YARS-PG type
+    label after its `Literal` label, e.g. `{"Literal", "Integer"}`.
+    """
+    if len(labels) == 2 and labels[0] == 'Literal':
+        return NATIVE_TYPES.get(labels[1])
+    return None
+
+
+def _expand_values(value, prefixes: dict):
+    if isinstance(value, list):
+        return [_expand_values(item, prefixes) for item in value]
+    if isinstance(value, dict):
+        value = {key: expand_iri(item, prefixes) if key in ('@datatype', '@id') and isinstance(item, str) else item
+                 for key, item in value.items()}
+    return value
+
+
+def expand_props(props: dict, prefixes: dict, iri_value: bool) -> dict:
+    """
+    Expand the compact IRIs of a property list: the `@value` when `iri_value`
+    is set, every `@datatype`, the `@reifier` of a collapsed reification, and
+    the predicate keys of folded properties together with the datatypes and
+    `@id` IRIs of their values.
+    """
+    expanded = {}
+    for key, value in props.items():
+        if key == '@value':
+            if iri_value and isinstance(value, str):
+                value = expand_iri(value, prefixes)
+        elif key in ('@datatype', '@reifier'):
+            if isinstance(value, str):
+                value = expand_iri(value, prefixes)
+        elif not key.startswith('@'):
+            key = expand_iri(key, prefixes)
+            value = _expand_values(value, prefixes)
+        expanded[key] = value
+    return expanded
+
+
+class YARSpgStatementReader:
+    """
+    Reads YARS-PG statements line by line without building a full parse tree.
+
+    Files written by `YARSpgSerializer` hold one statement per line, so nodes
+    and directed edges are matched with regular expressions and their
+    properties decoded as JSON. Any other line is handed to the ANTLR parser on
+    its own. Every statement carries the byte offset of its line, which lets
+    callers seek back to it later. Namespace prefixes declared in a metadata
+    statement are expanded in the IRI values of the statements that follow.
+    Literal nodes written with a native type label are returned with the
+    matching XSD `@datatype` instead, and schema statements are skipped.
+    """
+
+    NODE_PATTERN = re.compile(r'\((\w+)\s*(?:\{([^{}]*)\})?\s*(\[.*\])?\)$')
+    EDGE_PATTERN = re.compile(r'\((\w+)\)-\((?:\w+\s*)?(?:\{([^{}]*)\})?\s*(\[.*\])?\)->\((\w+)\)$')
+    VARIABLE_PATTERN = re.compile(r'\$(\w+)\s*=\s*(.*)$')
+    VARIABLE_PROPS = re.compile(r'\[\s*\$(\w+)\s*\]$')
+    VARIABLE_REFERENCE = re.compile(r'("(?:[^"\\]|\\.)*")|\$(\w+)')
+    METADATA_PATTERN = re.compile(r'\+\s*(\[.*\])$')
+
+    def __init__(self, stream: IO[bytes]):
+        self.stream = stream
+        self.variables = {}
+        self.prefixes = {}
+        self._labels = {}
+
+    def __iter__(self) -> Iterator:
+        for start, text in self.lines():
+            yield from self.read_line(text, start)
+
+    def lines(self) -> Iterator[Tuple[int, str]]:
+        """
+        Yield `(offset, text)` for every line holding statements, skipping blank lines and comments.
+        """
+        offset = self.stream.tell()
+        for line in self.stream:
+            start = offset
+            offset += len(line)
+            text = line.decode("utf-8").strip()
+            if text and not text.startswith('#'):
+                yield start, text
+
+    def scan(self) -> Iterator:
+        """
+        Yield `('node', offset, id)` and `('edge', offset, source, target)` tuples
+        without decoding labels or properties.
+        """
+        for start, text in self.lines():
+            match = self.NODE_PATTERN.match(text)
+            if match:
+                yield 'node', start, match.group(1)
+                continue
+            match = self.EDGE_PATTERN.match(text)
+            if match:
+                yield 'edge', start, match.group(1), match.group(4)
+                continue
+            for statement in self.read_line(text, start):
+                if isinstance(statement, NodeStatement):
+                    yield 'node', start, statement.id
+                else:
+                    yield 'edge', start, statement.source, statement.target
+
+    def read_line(self, text: str, offset: int = 0) -> Iterator:
+        """
+        Decode the statements of a single line. Variable declarations and
+        metadata yield nothing; they are recorded and applied to later lines.
+        A line whose labels or properties cannot be decoded is reported and
+        skipped, like the parse handler does.
+        """
+        try:
+            statements = list(self._decode_line(text, offset))
+        except json.JSONDecodeError as e:
+            print(f"Properties decoding error at byte {offset}: {e}")
+            print(f"Invalid statement: {text}")
+            return
+        yield from statements
+
+    def _decode_line(self, text: str, offset: int) -> Iterator:
+        if text.startswith('$'):
+            match = self.VARIABLE_PATTERN.match(text)
+            if match:
+                try:
+                    self.variables[match.group(1)] = json.loads("{" + match.group(2) + "}")
+                    return
+                except json.JSONDecodeError:
+                    pass
+        elif text.startswith('+'):
+            match = self.METADATA_PATTERN.match(text)
+            if match:
+                try:
+                    self.add_metadata(self.decode_props(match.group(1)))
+                    return
+                except json.JSONDecodeError:
+                    pass
+        match = self.NODE_PATTERN.match(text)
+        if match:
+            n_id, labels, props = match.groups()
+            statement = NodeStatement(offset, n_id, self.decode_labels(labels), self.decode_props(props))
+            if len(statement.labels) > 1:
+                statement = self.native_literal(statement)
+            yield self.expand(statement) if self.prefixes else statement
+            return
+        match = self.EDGE_PATTERN.match(text)
+        if match:
+            sid, labels, props, oid = match.groups()
+            statement = EdgeStatement(offset, sid, oid, self.decode_labels(labels), self.decode_props(props))
+            yield self.expand(statement) if self.prefixes else statement
+            return
+        for statement in self._parse_line(text, offset):
+            yield self.expand(statement) if self.prefixes else statement
+
+    @staticmethod
+    def native_literal(statement: NodeStatement) -> NodeStatement:
+        """
+        Replace the native type label of a literal node by its XSD `@datatype`.
+        """
+        datatype = native_datatype(statement.labels)
+        if datatype is None:
+            return statement
+        return statement._replace(labels=statement.labels[:1], props={**statement.props, '@datatype': datatype})
+
+    def add_metadata(self, metadata: dict) -> None:
+        prefixes = metadata.get(PREFIXES_KEY)
+        if isinstance(prefixes, dict):
+            self.prefixes.update(prefixes)
+
+    def expand(self, statement):
+        """
+        Expand the compact IRIs in the properties of a statement and in the type labels of a node.
+        """
+        statement = statement._replace(props=expand_props(statement.props, self.prefixes, 'IRI' in statement.labels))
+        if isinstance(statement, NodeStatement) and len(statement.labels) > 1:
+            statement = statement._replace(labels=self.expand_labels(statement.labels))
+        return statement
+
+    def expand_labels(self, labels: list) -> list:
+        """
+        Expand the compact IRIs of the type labels that follow the first node label.
+        """
+        return labels[:1] + [expand_iri(label, self.prefixes) for label in labels[1:]]
+
+    def decode_labels(self, labels: str) -> list:
+        if not labels:
+            return []
+        decoded = self._labels.get(labels)
+        if decoded is None:
+            decoded = json.loads("[" + labels + "]")
+            self._labels[labels] = decoded
+        return decoded
+
+    def decode_props(self, props: str) -> dict:
+        if not props:
+            return {}
+        body = props[1:-1]
+        if '$' not in body:
+            return json.loads("{" + body + "}")
+        match = self.VARIABLE_PROPS.match(props)
+        if match:
+            return dict(self.variable(match.group(1)))
+        body = self.VARIABLE_REFERENCE.sub(lambda m: m.group(1) or f'"$": "{m.group(2)}"', body)
+        pairs = json.loads("{" + body + "}", object_pairs_hook=lambda p: p if any(k == '$' for k, _ in p) else dict(p))
+        if isinstance(pairs, dict):
+            return pairs
+        decoded = {}
+        for key, value in pairs:
+            if key == '$':
+                decoded.update(self.variable(value))
+            else:
+                decoded[key] = value
+        return decoded
+
+    def variable(self, name: str) -> dict:
+        try:
+            return self.variables[name]
+        except KeyError:
+            raise ValueError(f"Undefined variable ${name}")
+
+    def _parse_line(self, text: str, offset: int) -> Iterator:
+        parser = YARSpgParser(CommonTokenStream(YARSpgLexer(InputStream(text))))
+        for statement in parser.yarspg().statement():
+            declaration = statement.variable_declaration()
+            if declaration is not None:
+                self.variables[declaration.variable().variable_name().getText()] = json.loads(
+                    "{" + ",".join(prop.getText() for prop in declaration.prop()) + "}")
+                continue
+            metadata = statement.metadata()
+            if metadata is not None:
+                self.add_metadata(self.decode_props(metadata.prop_list().getText()))
+                continue
+            node = statement.node()
+            if node is not None:
+                labels = [label.getText() for label in node.node_label()]
+                yield self.native_literal(NodeStatement(
+                    offset, node.node_id().getText(), json.loads("[" + ",".join(labels) + "]"),
+                    self.decode_props(node.prop_list().getText() if node.prop_list() else "")))
+                continue
+            edge = statement.edge()
+            if edge is not None:
+                edge = edge.directed() or edge.undirected()
+                labels = [label.getText() for label in edge.edge_label()]
+                yield EdgeStatement(offset, edge.node_id()[0].getText(), edge.node_id()[1].getText(),
+                                    json.loads("[" + ",".join(labels) + "]"),
+                                    self.decode_props(edge.prop_list().getText() if edge.prop_list() else ""))
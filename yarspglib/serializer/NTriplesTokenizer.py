@@ -0,0 +1,58 @@
+import re
+from typing import Optional, Tuple
+from rdflib.plugins.parsers.ntriples import unquote
+
+NTRIPLES_PATTERN = re.compile(
+    r'(<[^>]*>|_:\S+)\s*(<[^>]*>)\s*(<[^>]*>|_:\S+|"(?:[^"\\]|\\.)*"(?:@[A-Za-z0-9\-]+|\^\^<[^>]*>)?)\s*\.\s*$')
+LITERAL_SUFFIX = re.compile(r'(?:@([A-Za-z0-9\-]+)|\^\^<([^>]*)>)?$')
+
+XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+RDF_LANG_STRING = "http://www.w3.org/1999/02/22-rdf-syntax-ns#langString"
+XSD_STRING_SUFFIX = f"^^<{XSD_STRING}>"
+CANONICAL_ESCAPES = str.maketrans({"\\": "\\\\", "\"": "\\\"", "\n": "\\n", "\r": "\\r"})
+
+
+def tokenize_line(line: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split an N-Triples line into its subject, predicate and object in N-Triples
+    syntax, or return None for blank lines and comments.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    match = NTRIPLES_PATTERN.match(line)
+    if match is None:
+        raise ValueError(f"Invalid N-Triples line: {line}")
+    return match.groups()
+
+
+def literal_annotation(term: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the datatype IRI and language tag of an N-Triples literal.
+    """
+    suffix = term[term.rindex('"') + 1:]
+    lang, datatype = LITERAL_SUFFIX.match(suffix).groups()
+    return datatype, lang
+
+
+def normalize_term(term: str) -> str:
+    """
+    Return a canonical N-Triples form of a term, so that equal RDF terms get
+    the same dictionary key: escape sequences are decoded (literals keep only
+    the escapes N-Triples requires), an explicit `xsd:string` datatype is
+    dropped and language tags are lower-cased.
+    """
+    if not term.startswith('"'):
+        return unquote(term) if '\\' in term else term
+    end = term.rindex('"')
+    suffix = term[end + 1:]
+    if suffix == XSD_STRING_SUFFIX:
+        suffix = ''
+    elif suffix.startswith('@') and not suffix.islower():
+        suffix = suffix.lower()
+    elif '\\' not in term:
+        return term
+    lexical = term[1:end]
+    if '\\' in lexical:
+        lexical = unquote(lexical).translate(CANONICAL_ESCAPES)
+    return f'"{lexical}"{suffix}'
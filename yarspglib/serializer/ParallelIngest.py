@@ -0,0 +1,172 @@
+import os
+from multiprocessing import Pool
+from typing import IO, List, Optional, Tuple
+import numpy as np
+from rdflib import Graph, URIRef
+from rdflib.plugins.parsers.ntriples import unquote
+from rdflib.util import from_n3
+from yarspglib.serializer.NTriplesTokenizer import tokenize_line, literal_annotation, normalize_term
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer
+
+SUBJECT, OBJECT = 0, 1
+
+
+def byte_ranges(path: str, chunk_count: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into at most `chunk_count` byte ranges that start and end on line boundaries.
+    """
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for chunk in range(1, chunk_count):
+            f.seek(max(size * chunk // chunk_count, bounds[-1]))
+            f.readline()
+            bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def serialize_literal_term(serializer: YARSpgSerializer, term: str) -> str:
+    """
+    Serialize an N-Triples literal straight from its lexical form, without
+    building an rdflib `Literal` and converting it to a Python value.
+    """
+    end = term.rindex('"')
+    lexical = term[1:end]
+    if '\\' in lexical:
+        lexical = unquote(lexical)
+    datatype, lang = literal_annotation(term)
+    return serializer.serialize_literal(lexical, URIRef(datatype) if datatype else None, lang)
+
+
+def encode_range(task: Tuple[str, int, int]) -> tuple:
+    """
+    Tokenize one byte range of an N-Triples file and dictionary-encode it locally.
+
+    Terms are keyed by their normalized N-Triples form, so differently written
+    forms of the same RDF term, such as `"A"` and `"A"^^xsd:string`, share a node.
+
+    Returns the local terms in order of first occurrence, the role (subject or
+    object) of that first occurrence, their serialized node type and value, the
+    local predicates with their serialized edge labels, and an `(n, 3)` array of
+    local subject, predicate and object codes.
+    """
+    path, start, end = task
+    serializer = YARSpgSerializer(Graph())
+    terms, predicates = {}, {}
+    roles, edges = [], []
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f.read(end - start).decode("utf-8").splitlines():
+            triple = tokenize_line(line)
+            if triple is None:
+                continue
+            subject, predicate, obj = triple
+            if '\\' in subject or '\\' in predicate:
+                subject, predicate = normalize_term(subject), normalize_term(predicate)
+            obj = normalize_term(obj)
+            s = terms.get(subject)
+            if s is None:
+                s = terms[subject] = len(terms)
+                roles.append(SUBJECT)
+            o = terms.get(obj)
+            if o is None:
+                o = terms[obj] = len(terms)
+                roles.append(OBJECT)
+            p = predicates.get(predicate)
+            if p is None:
+                p = predicates[predicate] = len(predicates)
+            edges.extend((s, p, o))
+    nodes = []
+    for term in terms:
+        if term.startswith('"'):
+            nodes.append(('Literal', serialize_literal_term(serializer, term)))
+        else:
+            node = from_n3(term)
+            nodes.append((serializer.typeOf(node), serializer.serialize_value(node)))
+    labels = [serializer._serialize_predicate(from_n3(predicate)) for predicate in predicates]
+    return (list(terms), roles, nodes, list(predicates), labels,
+            np.array(edges, dtype=np.int64).reshape(-1, 3))
+
+
+class ParallelNTriplesIngest:
+    """
+    Serializes an N-Triples file to YARS-PG using a process pool.
+
+    The file is split into byte ranges aligned to line boundaries; each worker
+    tokenizes its range, encodes terms and predicates into local dictionaries
+    and serializes the distinct terms. The main process merges the local
+    dictionaries in file order into global `s<n>`/`o<n>` ids, so a node gets
+    the id a sequential pass over the file would give it, remaps the local
+    edge arrays with NumPy and drops duplicate triples before writing.
+    With `predicate_variables`, edge labels reference predicate variables
+    declared at the top of the edge section.
+    """
+
+    def __init__(self, path: str, jobs: Optional[int] = None, chunks_per_job: int = 4,
+                 predicate_variables: bool = False):
+        self.path = path
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunks_per_job = chunks_per_job
+        self.node_lines = []
+        self.predicates = []
+        self.predicate_labels = []
+        self.predicate_variables = predicate_variables
+        self.node_ids = []
+        self.edges = np.empty((0, 3), dtype=np.int64)
+
+    def run(self) -> None:
+        tasks = [(self.path, start, end) for start, end in byte_ranges(self.path, self.jobs * self.chunks_per_job)]
+        node_codes, predicate_codes = {}, {}
+        subject_counter, object_counter = 1, 1
+        parts = []
+        with Pool(self.jobs) as pool:
+            for terms, roles, nodes, predicates, labels, edges in pool.imap(encode_range, tasks):
+                term_map = np.empty(len(terms), dtype=np.int64)
+                for local, (term, role, (node_type, value)) in enumerate(zip(terms, roles, nodes)):
+                    code = node_codes.get(term)
+                    if code is None:
+                        code = node_codes[term] = len(self.node_ids)
+                        if role == SUBJECT:
+                            node_id = f"s{subject_counter}"
+                            subject_counter += 1
+                        else:
+                            node_id = f"o{object_counter}"
+                            object_counter += 1
+                        self.node_ids.append(node_id)
+                        self.node_lines.append(YARSpgSerializer.format_node(node_id, node_type, value))
+                    term_map[local] = code
+                predicate_map = np.empty(len(predicates), dtype=np.int64)
+                for local, (predicate, label) in enumerate(zip(predicates, labels)):
+                    code = predicate_codes.get(predicate)
+                    if code is None:
+                        code = predicate_codes[predicate] = len(self.predicate_labels)
+                        self.predicates.append(predicate)
+                        self.predicate_labels.append(label)
+                    predicate_map[local] = code
+                if len(edges):
+                    parts.append(np.stack((term_map[edges[:, 0]], predicate_map[edges[:, 1]],
+                                           term_map[edges[:, 2]]), axis=1))
+        if parts:
+            edges = np.concatenate(parts)
+            _, first = np.unique(edges, axis=0, return_index=True)
+            self.edges = edges[np.sort(first)]
+
+    def serialize(self, stream: IO[bytes]) -> None:
+        """
+        Write the merged nodes and edges as a YARS-PG file.
+        """
+        stream.write(b"# Nodes\n")
+        for start in range(0, len(self.node_lines), 10000):
+            stream.write("".join(self.node_lines[start:start + 10000]).encode("utf-8"))
+        stream.write(b"# Edges\n")
+        node_ids, labels = self.node_ids, self.predicate_labels
+        if self.predicate_variables:
+            serializer = YARSpgSerializer(Graph(), predicate_variables=True)
+            predicates = [from_n3(predicate) for predicate in self.predicates]
+            stream.write(serializer.variable_declarations(predicates).encode("utf-8"))
+            labels = [serializer._serialize_predicate(predicate) for predicate in predicates]
+        for start in range(0, len(self.edges), 10000):
+            rows = self.edges[start:start + 10000].tolist()
+            stream.write("".join(YARSpgSerializer.format_edge(node_ids[s], labels[p], node_ids[o])
+                                 for s, p, o in rows).encode("utf-8"))
@@ -1,22 +1,115 @@
-from typing import IO, Optional
-from rdflib import URIRef, Literal, Graph
+import base64
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain
+from typing import IO, Iterable, Iterator, Optional
+import rdflib
+from rdflib import URIRef, Literal, Graph, RDF
 from rdflib.serializer import Serializer
 from rdflib.term import Node
 from tqdm import tqdm
+from yarspglib.node_dictionary import NodeDictionary
+from yarspglib.parser.YARSpgStatementReader import PREFIXES_KEY, NATIVE_TYPES
+from yarspglib.sketches import HyperLogLog, hash64, hash_values
 
+STRING_ESCAPES = str.maketrans({**{chr(code): f"\\u{code:04x}" for code in [*range(0x20), 0x7f]},
+                                "\\": "\\\\", "\"": "\\\"", "\n": "\\n", "\r": "\\r", "\t": "\\t",
+                                "\b": "\\b", "\f": "\\f"})
+
+
+@contextmanager
+def lexical_literals() -> Iterator[None]:
+    """
+    Keep the lexical form of typed literals parsed inside the block.
+
+    rdflib normalizes them by default, e.g. `"0042"^^xsd:integer` to `"42"`,
+    which would make the serializer write a different value than the input.
+    """
+    previous = rdflib.NORMALIZE_LITERALS
+    rdflib.NORMALIZE_LITERALS = False
+    try:
+        yield
+    finally:
+        rdflib.NORMALIZE_LITERALS = previous
 
 class YARSpgSerializer(Serializer):
     """
     Serializes RDF graphs to YARS-PG format.
+
+    Node ids are `s<n>`/`o<n>` counters in graph iteration order by default.
+    With `id_scheme='hash'` they are derived from a hash of the node term
+    instead, and nodes and edges are written sorted, so the same input always
+    gives the same output and separately serialized slices share ids.
+
+    With `predicate_variables`, every predicate IRI is declared once as a
+    YARS-PG variable at the top of the edge section and edges reference it as
+    `[$p<hash>]` instead of repeating the IRI.
+
+    With `namespace_prefixes`, frequent IRI namespaces are listed in a
+    `+["@prefixes": {...}]` metadata statement at the top of the file and IRI
+    values are written as compact `prefix:local` names.
+
+    With `fold_literals`, triples with a literal object become properties of
+    the subject node keyed by the predicate IRI instead of a `Literal` node
+    and an edge. A plain string is written as is, a typed or language-tagged
+    literal as a `{"@value", "@datatype"/"@lang"}` struct, and several values
+    of one predicate as a list.
+
+    With `type_labels`, `rdf:type` triples with an IRI object become extra
+    labels of the subject node after its `IRI`/`BNode` label instead of edges
+    into the class nodes.
+
+    With `collapse_reification`, every standard reification (a node with
+    `rdf:type rdf:Statement` and one `rdf:subject`, `rdf:predicate` and
+    `rdf:object`) that is not itself the object of a triple becomes a single
+    edge with an `r<n>` edge id. The reifier is kept in `@reifier`, further
+    statements about it become edge properties, and `"@asserted": "false"`
+    marks a reified triple that is not in the graph itself.
+
+    With `native_types`, literal nodes with a common XSD numeric, boolean or
+    date datatype get the matching YARS-PG primitive type as a second label,
+    e.g. `{"Literal", "Integer"}`, instead of an `@datatype` IRI. A schema
+    statement at the top of the node section declares the type of `@value`
+    for every such label in use.
     """
 
-    def __init__(self, store: Graph):
+    HASH_ID_LENGTH = 13
+    VARIABLE_NAME_LENGTH = 8
+    MIN_PREFIX_COUNT = 2
+    PREFIX_NAME = re.compile(r'[A-Za-z][\w.-]*$')
+    NATIVE_LABELS = {URIRef(datatype): label for label, datatype in NATIVE_TYPES.items()}
+
+    def __init__(self, store: Graph, dictionary=None, id_scheme: str = 'counter', predicate_variables: bool = False,
+                 namespace_prefixes: bool = False, fold_literals: bool = False, type_labels: bool = False,
+                 collapse_reification: bool = False, native_types: bool = False):
+        if id_scheme not in ('counter', 'hash'):
+            raise ValueError(f"Unknown id scheme: {id_scheme}")
         super().__init__(store)
         self.nodes = {}
         self.edges = []
         self.node_map = {}
-        self.subject_counter = 1
-        self.object_counter = 1
+        self.dictionary = dictionary
+        self.id_scheme = id_scheme
+        self._colliding_ids = set()
+        self.predicate_variables = predicate_variables
+        self.variable_names = {}
+        self._variable_predicates = {}
+        self.namespace_prefixes = namespace_prefixes
+        self.prefixes = {}
+        self.namespace_names = {}
+        self.fold_literals = fold_literals
+        self.properties = {}
+        self.type_labels = type_labels
+        self.node_labels = {}
+        self.collapse_reification = collapse_reification
+        self.reified_edges = []
+        self.native_types = native_types
+        self.subject_counter = dictionary.subject_counter if dictionary is not None else 1
+        self.object_counter = dictionary.object_counter if dictionary is not None else 1
         self.datatype_counter = 1
         self.lang_counter = 1
 
@@ -28,14 +121,240 @@ class YARSpgSerializer(Serializer):
             **args,
     ) -> None:
 
+        self.process_triples()
+        if self.namespace_prefixes:
+            self.collect_prefixes()
+            stream.write(self.metadata_line().encode("utf-8"))
+        self.serialize_nodes(stream)
+        self.serialize_edges(stream)
+
+    def process_triples(self) -> None:
+        """
+        Assign node ids to all terms of the graph and collect its edges.
+        """
         total_iterations = len(self.store)
+        reified = self.find_reified_statements() if self.collapse_reification else {}
+        absorbed = {triple for triple in reified.values() if triple in self.store}
+        annotations = {}
 
         for triple in tqdm(self.store, total=total_iterations, desc="Processing"):
             subject, predicate, obj = triple
+            if reified:
+                if subject in reified:
+                    if predicate not in (RDF.subject, RDF.predicate, RDF.object) \
+                            and (predicate, obj) != (RDF.type, RDF.Statement):
+                        annotations.setdefault(subject, {}).setdefault(predicate, []).append(obj)
+                    continue
+                if triple in absorbed:
+                    continue
             self.serialize_triple(subject, predicate, obj)
 
-        self.serialize_nodes(stream)
-        self.serialize_edges(stream)
+        for number, (reifier, (subject, predicate, obj)) in enumerate(reified.items(), 1):
+            edge_id = "r" + self.term_hash_id(reifier)[1:] if self.id_scheme == 'hash' else f"r{number}"
+            self.get_or_create_node(subject, is_subject=True)
+            target = self.get_or_create_node(obj, is_subject=False)
+            self.reified_edges.append((self.node_map[subject], predicate, target, edge_id, reifier,
+                                       annotations.get(reifier, {}), (subject, predicate, obj) in absorbed))
+
+        if self.id_scheme == 'hash':
+            self.nodes = dict(sorted(self.nodes.items()))
+            self.edges.sort(key=lambda edge: (edge[0], str(edge[1]), edge[2]))
+            for labels in self.node_labels.values():
+                labels.sort()
+            self.reified_edges.sort(key=lambda edge: edge[3])
+            for properties in chain(self.properties.values(), (edge[5] for edge in self.reified_edges)):
+                for values in properties.values():
+                    values.sort(key=lambda value: value.n3())
+                sorted_properties = sorted(properties.items(), key=lambda item: str(item[0]))
+                properties.clear()
+                properties.update(sorted_properties)
+
+    def find_reified_statements(self) -> dict:
+        """
+        Map every reifier that can be collapsed into an edge to the triple it reifies.
+        """
+        reified = {}
+        for reifier in dict.fromkeys(self.store.subjects(RDF.type, RDF.Statement)):
+            if next(self.store.subjects(None, reifier), None) is not None:
+                continue
+            parts = [list(self.store.objects(reifier, part)) for part in (RDF.subject, RDF.predicate, RDF.object)]
+            if any(len(values) != 1 for values in parts):
+                continue
+            (subject,), (predicate,), (obj,) = parts
+            if isinstance(subject, Literal) or not isinstance(predicate, URIRef) or subject == reifier:
+                continue
+            reified[reifier] = (subject, predicate, obj)
+        return reified
+
+    def serialize_shards(self, directory: str, shard_count: int) -> dict:
+        """
+        Serialize the graph as `shard_count` self-contained YARS-PG files plus a
+        `manifest.json` in `directory`, and return the manifest.
+
+        Nodes are partitioned by a stable hash of their term and edges follow
+        their source node. Targets owned by another shard are repeated as stub
+        node statements, so every shard parses on its own and the union of the
+        parsed shards is the whole graph.
+        """
+        self.process_triples()
+        if self.namespace_prefixes:
+            self.collect_prefixes()
+        owners = {node_id: hash64(self.node_key(node_data['value'])) % shard_count
+                  for node_id, node_data in self.nodes.items()}
+        shard_nodes = [[] for _ in range(shard_count)]
+        for node_id, shard in owners.items():
+            shard_nodes[shard].append(node_id)
+        shard_edges = [[] for _ in range(shard_count)]
+        for edge in self.edges:
+            shard_edges[owners[edge[0]]].append(edge)
+        shard_reified_edges = [[] for _ in range(shard_count)]
+        for edge in self.reified_edges:
+            shard_reified_edges[owners[edge[0]]].append(edge)
+
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for shard in range(shard_count):
+            path = f"shard-{shard:05d}.yarspg"
+            targets = chain((edge[2] for edge in shard_edges[shard]), (edge[2] for edge in shard_reified_edges[shard]))
+            stubs = list(dict.fromkeys(target for target in targets if owners[target] != shard))
+            with open(os.path.join(directory, path), "wb") as f:
+                if self.prefixes:
+                    f.write(self.metadata_line().encode("utf-8"))
+                f.write(b"# Nodes\n")
+                if self.native_types:
+                    f.write(self.schema_lines().encode("utf-8"))
+                f.write("".join(self.node_line(node_id) for node_id in shard_nodes[shard]).encode("utf-8"))
+                if stubs:
+                    f.write(b"# Stub nodes owned by other shards\n")
+                    f.write("".join(self.node_line(node_id, with_properties=False) for node_id in stubs).encode("utf-8"))
+                f.write(b"# Edges\n")
+                if self.predicate_variables:
+                    predicates = dict.fromkeys(predicate for _, predicate, _ in shard_edges[shard])
+                    f.write(self.variable_declarations(predicates).encode("utf-8"))
+                f.write("".join(self.edge_line(*edge) for edge in shard_edges[shard]).encode("utf-8"))
+                f.write("".join(self.reified_edge_line(*edge) for edge in shard_reified_edges[shard]).encode("utf-8"))
+            files.append({'path': path, 'nodes': len(shard_nodes[shard]), 'stub_nodes': len(stubs),
+                          'edges': len(shard_edges[shard]) + len(shard_reified_edges[shard])})
+
+        manifest = {
+            'format': 'yarspg-shards',
+            'version': 1,
+            'shards': shard_count,
+            'partitioning': {'nodes': 'blake2b-64 of the node term modulo shards', 'edges': 'source node'},
+            'nodes': len(self.nodes),
+            'edges': len(self.edges) + len(self.reified_edges),
+            'files': files,
+        }
+        with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    @staticmethod
+    def split_iri(iri: str) -> tuple:
+        """
+        Split an IRI into its namespace, up to the last `#` or `/`, and local name.
+        """
+        position = max(iri.rfind('#'), iri.rfind('/')) + 1
+        return iri[:position], iri[position:]
+
+    def collect_prefixes(self) -> dict:
+        """
+        Choose the namespace prefixes of the graph by counting how often the
+        namespaces of node, predicate and datatype IRIs are written. A
+        namespace is kept when it occurs at least `MIN_PREFIX_COUNT` times and
+        compacting it saves more than its table entry costs. Names bound in `graph.namespaces()` are reused, the
+        rest are numbered `ns<n>`; names equal to an IRI scheme of the graph
+        are never used, so full IRIs cannot be mistaken for compact ones.
+        """
+        iris = Counter(str(data['value']) for data in self.nodes.values() if data['type'] == 'IRI')
+        iris.update(str(data['datatype']) for data in self.nodes.values()
+                    if data.get('datatype') and self.native_label(data) is None)
+        iris.update(str(label) for labels in self.node_labels.values() for label in labels)
+        for properties in chain(self.properties.values(), (edge[5] for edge in self.reified_edges)):
+            iris.update(str(predicate) for predicate in properties)
+            for values in properties.values():
+                iris.update(str(value.datatype) if isinstance(value, Literal) else str(value)
+                            for value in values if not isinstance(value, Literal) or value.datatype)
+        iris.update(str(edge[4]) for edge in self.reified_edges if isinstance(edge[4], URIRef))
+        iris.update(str(edge[1]) for edge in self.reified_edges)
+        predicates = Counter(predicate for _, predicate, _ in self.edges)
+        iris.update({str(predicate): 1 if self.predicate_variables else count
+                     for predicate, count in predicates.items()})
+        counts = Counter()
+        schemes = set()
+        for iri, count in iris.items():
+            namespace, _ = self.split_iri(iri)
+            if namespace:
+                counts[namespace] += count
+            schemes.add(iri.partition(':')[0])
+        bound = {str(namespace): prefix for prefix, namespace in self.store.namespaces()}
+
+        self.prefixes, self.namespace_names = {}, {}
+        number = 1
+        for namespace, count in counts.most_common():
+            if count < self.MIN_PREFIX_COUNT:
+                break
+            name = bound.get(namespace)
+            if not name or not self.PREFIX_NAME.match(name) or name in schemes or name in self.prefixes:
+                while f"ns{number}" in schemes or f"ns{number}" in self.prefixes:
+                    number += 1
+                name = f"ns{number}"
+            if count * (len(namespace) - len(name) - 1) <= len(namespace) + len(name) + 6:
+                continue
+            self.prefixes[name] = namespace
+            self.namespace_names[namespace] = name
+        return self.prefixes
+
+    def metadata_line(self) -> str:
+        """
+        Serialize the metadata statement declaring the namespace prefixes.
+        """
+        return f"+[{json.dumps(PREFIXES_KEY)}: {json.dumps(self.prefixes, ensure_ascii=False)}]\n"
+
+    def compact_iri(self, iri: str) -> str:
+        """
+        Write an IRI as `prefix:local` when its namespace has a prefix.
+        """
+        namespace, local = self.split_iri(iri)
+        name = self.namespace_names.get(namespace)
+        return iri if name is None else f"{name}:{local}"
+
+    @staticmethod
+    def node_sketch(keys: Iterable[str], precision: int = 14, chunk_size: int = 100000) -> HyperLogLog:
+        """
+        Build a HyperLogLog sketch of a stream of node keys, hashed in chunks,
+        to estimate the size of a node table before building it.
+        """
+        sketch = HyperLogLog(precision)
+        chunk = []
+        for key in keys:
+            chunk.append(key)
+            if len(chunk) >= chunk_size:
+                sketch.add_hashes(hash_values(chunk))
+                chunk = []
+        sketch.add_hashes(hash_values(chunk))
+        return sketch
+
+    def estimate_node_counts(self, precision: int = 14, chunk_size: int = 100000) -> dict:
+        """
+        Estimate the number of subject, object and total nodes before serializing,
+        using HyperLogLog sketches instead of a node dictionary.
+        """
+        subjects, objects = HyperLogLog(precision), HyperLogLog(precision)
+        subject_keys, object_keys = [], []
+        for subject, _, obj in self.store:
+            subject_keys.append(subject.n3())
+            object_keys.append(obj.n3())
+            if len(subject_keys) >= chunk_size:
+                subjects.add_hashes(hash_values(subject_keys))
+                objects.add_hashes(hash_values(object_keys))
+                subject_keys, object_keys = [], []
+        subjects.add_hashes(hash_values(subject_keys))
+        objects.add_hashes(hash_values(object_keys))
+        estimate = {'subjects': subjects.estimate(), 'objects': objects.estimate()}
+        subjects.merge(objects)
+        estimate['nodes'] = subjects.estimate()
+        return estimate
 
     def serialize_triple(
             self,
@@ -44,14 +363,29 @@ class YARSpgSerializer(Serializer):
             obj: Node
     ) -> None:
         sid = self.get_or_create_node(subject, is_subject=True)
+        if self.type_labels and predicate == RDF.type and isinstance(obj, URIRef):
+            self.node_labels.setdefault(sid, []).append(obj)
+            return
+        if self.fold_literals and isinstance(obj, Literal):
+            self.properties.setdefault(sid, {}).setdefault(predicate, []).append(obj)
+            return
         oid = self.get_or_create_node(obj, is_subject=False)
-        self.edges.append((sid, predicate, oid))
+        # Creating the object node can rename a colliding hash id of the subject
+        self.edges.append((self.node_map[subject], predicate, oid))
 
     def get_or_create_node(self, node: Node, is_subject: bool) -> str:
         if node in self.node_map:
             return self.node_map[node]
 
-        if is_subject:
+        if self.dictionary is not None:
+            node_id = self.dictionary.get(self.node_key(node))
+            if node_id is not None:
+                self.node_map[node] = node_id
+                return node_id
+
+        if self.id_scheme == 'hash':
+            node_id = self.hash_node_id(node)
+        elif is_subject:
             node_id = f"s{self.subject_counter}"
             self.subject_counter += 1
         else:
@@ -76,6 +410,40 @@ class YARSpgSerializer(Serializer):
         self.node_map[node] = node_id
         return node_id
 
+    def term_hash_id(self, node: Node, full: bool = False) -> str:
+        """
+        Content-addressed id of a term: `n` followed by the base32 BLAKE2b digest
+        of its key, cut to `HASH_ID_LENGTH` characters unless `full` is set.
+        """
+        digest = hashlib.blake2b(self.node_key(node).encode("utf-8"), digest_size=20).digest()
+        return "n" + base64.b32encode(digest).decode("ascii").lower()[:None if full else self.HASH_ID_LENGTH]
+
+    def hash_node_id(self, node: Node) -> str:
+        """
+        Pick the hash id of a new node. Terms whose short ids collide all get
+        the full-length digest instead, whichever of them was seen first.
+        """
+        node_id = self.term_hash_id(node)
+        if node_id in self._colliding_ids:
+            return self.term_hash_id(node, full=True)
+        other = self.nodes.get(node_id)
+        if other is None:
+            return node_id
+        self._colliding_ids.add(node_id)
+        renamed = self.term_hash_id(other['value'], full=True)
+        self.nodes[renamed] = self.nodes.pop(node_id)
+        self.node_map[other['value']] = renamed
+        self.edges = [(renamed if source == node_id else source, predicate, renamed if target == node_id else target)
+                      for source, predicate, target in self.edges]
+        self.reified_edges = [(renamed if edge[0] == node_id else edge[0], edge[1],
+                               renamed if edge[2] == node_id else edge[2], *edge[3:])
+                              for edge in self.reified_edges]
+        if node_id in self.properties:
+            self.properties[renamed] = self.properties.pop(node_id)
+        if node_id in self.node_labels:
+            self.node_labels[renamed] = self.node_labels.pop(node_id)
+        return self.term_hash_id(node, full=True)
+
     def createNode(self, node_id: str, node_type: str, value: Node, datatype: Optional[str] = None,
                    lang: Optional[str] = None) -> None:
         node_data = {"type": node_type, "value": value}
@@ -89,55 +457,192 @@ class YARSpgSerializer(Serializer):
         Serialize all nodes. Add `# Nodes` in the beginning.
         """
         stream.write(b"# Nodes\n")
-        for node_id, node_data in self.nodes.items():
-            node_type = node_data['type']
-            value = node_data['value']
-            if node_type == 'IRI':
-                node_str = f"({node_id} {{\"IRI\"}} [{self.serialize_value(value)}])\n"
-            elif node_type == 'Literal':
-                node_str = f"({node_id} {{\"Literal\"}} [{self.serialize_value(value)}])\n"
-            else:
-                node_str = f"({node_id} {{\"BNode\"}} [{self.serialize_value(value)}])\n"
-            stream.write(node_str.encode("utf-8"))
+        if self.native_types:
+            stream.write(self.schema_lines().encode("utf-8"))
+        for node_id in self.nodes:
+            stream.write(self.node_line(node_id).encode("utf-8"))
+
+    def node_line(self, node_id: str, with_properties: bool = True) -> str:
+        """
+        Serialize a single node statement, with its type labels and folded
+        literal properties unless `with_properties` is False.
+        """
+        node_data = self.nodes[node_id]
+        native_label = self.native_label(node_data)
+        labels = ()
+        if native_label is not None:
+            serialized_value = self.serialize_literal(node_data['value'])
+            labels = (native_label,)
+        else:
+            serialized_value = self.serialize_value(node_data['value'])
+        if with_properties and node_id in self.node_labels:
+            labels = [self.serialize_iri(label) for label in self.node_labels[node_id]]
+        if with_properties and node_id in self.properties:
+            serialized_value += "".join(f", \"{self.serialize_iri(predicate)}\": "
+                                        f"{self.serialize_property(values)}"
+                                        for predicate, values in self.properties[node_id].items())
+        return self.format_node(node_id, node_data['type'], serialized_value, labels)
+
+    def native_label(self, node_data: dict) -> Optional[str]:
+        """
+        The native type label written for a literal node, if `native_types` is set and its datatype has one.
+        """
+        if not self.native_types or node_data.get('datatype') is None:
+            return None
+        return self.NATIVE_LABELS.get(node_data['datatype'])
+
+    def schema_lines(self) -> str:
+        """
+        Serialize a node schema statement for every native type label used by the graph.
+        """
+        used = {self.native_label(node_data) for node_data in self.nodes.values()}
+        return "".join(f"S(Literal{label} {{\"Literal\", \"{label}\"}} [\"@value\": {label}])\n"
+                       for label in NATIVE_TYPES if label in used)
+
+    def serialize_property(self, values: list) -> str:
+        """
+        Serialize the values of a folded property or edge annotation: literals
+        as plain strings or `{"@value", ...}` structs, other terms as `{"@id"}`.
+        """
+        serialized = [f"{{\"@id\": \"{self.serialize_iri(value)}\"}}" if not isinstance(value, Literal)
+                      else f"\"{self.escape_string(value)}\"" if value.datatype is None and value.language is None
+                      else f"{{{self.serialize_value(value)}}}" for value in values]
+        return serialized[0] if len(serialized) == 1 else f"[{', '.join(serialized)}]"
+
+    @staticmethod
+    def format_node(node_id: str, node_type: str, serialized_value: str, labels=()) -> str:
+        if labels:
+            node_type += "".join(f"\", \"{label}" for label in labels)
+        return f"({node_id} {{\"{node_type}\"}} [{serialized_value}])\n"
 
     def serialize_edges(self, stream: IO[bytes]) -> None:
         """
         Serialize all edges. Add `# Edges` in the beginning.
         """
         stream.write(b"# Edges\n")
+        if self.predicate_variables:
+            predicates = dict.fromkeys(predicate for _, predicate, _ in self.edges)
+            stream.write(self.variable_declarations(predicates).encode("utf-8"))
         for source_id, predicate, destination_id in self.edges:
-            edge_str = f"({source_id})-({self._serialize_predicate(predicate)})->({destination_id})\n"
-            stream.write(edge_str.encode("utf-8"))
+            stream.write(self.edge_line(source_id, predicate, destination_id).encode("utf-8"))
+        for edge in self.reified_edges:
+            stream.write(self.reified_edge_line(*edge).encode("utf-8"))
         print('Numer of nodes:', len(self.nodes))
-        print('Number of edges:', len(self.edges))
+        print('Number of edges:', len(self.edges) + len(self.reified_edges))
+
+    def edge_line(self, source_id: str, predicate: Node, destination_id: str) -> str:
+        """
+        Serialize a single edge statement.
+        """
+        return self.format_edge(source_id, self._serialize_predicate(predicate), destination_id)
+
+    def reified_edge_line(self, source_id: str, predicate: Node, destination_id: str, edge_id: str, reifier: Node,
+                          annotations: dict, asserted: bool) -> str:
+        """
+        Serialize a collapsed reification as a single edge statement with an edge id.
+        """
+        props = f"{self.serialize_value(predicate)}, \"@reifier\": \"{self.serialize_iri(reifier)}\""
+        if not asserted:
+            props += ", \"@asserted\": \"false\""
+        props += "".join(f", \"{self.serialize_iri(key)}\": {self.serialize_property(values)}"
+                         for key, values in annotations.items())
+        return f"({source_id})-({edge_id} {{\"IRI\"}} [{props}])->({destination_id})\n"
+
+    @staticmethod
+    def format_edge(source_id: str, serialized_predicate: str, destination_id: str) -> str:
+        return f"({source_id})-({serialized_predicate})->({destination_id})\n"
+
+    def node_key(self, node: Node) -> str:
+        """
+        Key identifying a node term, as used by `NodeDictionary`.
+        """
+        if isinstance(node, Literal):
+            return NodeDictionary.node_key('Literal', self.literal_value(node), node.datatype, node.language)
+        return NodeDictionary.node_key(self.typeOf(node), str(node))
+
+    @staticmethod
+    def literal_value(value: Literal) -> str:
+        """
+        The unescaped `@value` written for a literal: its lexical form.
+        """
+        return str(value)
 
     def serialize_value(self, value: Node) -> str:
         """
         Serialize the value of the node or edge.
         """
         if isinstance(value, URIRef):
-            return f"\"@value\": \"{value}\""
+            return f"\"@value\": \"{self.serialize_iri(value)}\""
 
-        serialized_value = f"\"@value\": \"{value}\""
         if isinstance(value, Literal):
-            if isinstance(value.value, str):
-                value_str = value.value
-                value_str = value_str.replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
-            else:
-                value_str = value.value
-            serialized_value = f"\"@value\": \"{value_str}\""
-            if value.datatype:
-                serialized_value += f", \"@datatype\": \"{value.datatype}\""
-            if value.language:
-                serialized_value += f", \"@lang\": \"{value.language}\""
+            return self.serialize_literal(value, value.datatype, value.language)
+        return f"\"@value\": \"{value}\""
+
+    def serialize_literal(self, lexical: str, datatype: Optional[URIRef] = None, language: Optional[str] = None) -> str:
+        """
+        Serialize a literal from its lexical form. The Python value rdflib
+        derives from typed literals is never used, so values are written
+        exactly as they appear in RDF input parsed under `lexical_literals`.
+        """
+        serialized_value = f"\"@value\": \"{self.escape_string(lexical)}\""
+        if datatype:
+            serialized_value += f", \"@datatype\": \"{self.serialize_iri(datatype)}\""
+        if language:
+            serialized_value += f", \"@lang\": \"{language}\""
         return serialized_value
 
+    def serialize_iri(self, value: Node) -> str:
+        """
+        Write an IRI compacted with the namespace prefixes, if any. Blank nodes are written by their id.
+        """
+        return self.compact_iri(value) if self.namespace_names and isinstance(value, URIRef) else f"{value}"
+
+    @staticmethod
+    def escape_string(value: str) -> str:
+        """
+        Escape backslashes, quotes and control characters in a string value
+        with a single pass over the precompiled `STRING_ESCAPES` table: the
+        JSON short forms where they exist, `\\u00XX` for the other C0
+        characters and DEL. Most values need no escaping and are returned
+        after a cheap check.
+        """
+        if value.isprintable() and '"' not in value and '\\' not in value:
+            return value
+        return value.translate(STRING_ESCAPES)
+
     def _serialize_predicate(self, predicate: Node) -> str:
         """
         Serialize the predicate of the edge.
         """
+        if self.predicate_variables:
+            return f"{{\"IRI\"}} [${self.variable_name(predicate)}]"
         return f"{{\"IRI\"}} [{self.serialize_value(predicate)}]"
 
+    def variable_name(self, predicate: Node) -> str:
+        """
+        Name of the variable declaring a predicate: `p` followed by a base32
+        BLAKE2b digest of the IRI, cut to `VARIABLE_NAME_LENGTH` characters
+        unless another predicate already took that name.
+        """
+        name = self.variable_names.get(predicate)
+        if name is not None:
+            return name
+        digest = base64.b32encode(hashlib.blake2b(str(predicate).encode("utf-8"), digest_size=20).digest())
+        digest = digest.decode("ascii").lower()
+        name = "p" + digest[:self.VARIABLE_NAME_LENGTH]
+        if self._variable_predicates.get(name, predicate) != predicate:
+            name = "p" + digest
+        self._variable_predicates[name] = predicate
+        self.variable_names[predicate] = name
+        return name
+
+    def variable_declarations(self, predicates) -> str:
+        """
+        Serialize the variable declarations of the given predicates.
+        """
+        return "".join(f"${self.variable_name(predicate)} = {self.serialize_value(predicate)}\n"
+                       for predicate in predicates)
+
     def typeOf(self, node: Node) -> str:
         """
         Determine the type of the node (IRI, Literal, Blank Node).
@@ -0,0 +1,113 @@
+import hashlib
+from typing import Iterable
+import numpy as np
+
+
+def hash64(value: str) -> int:
+    """
+    Deterministic 64-bit hash of a string, stable across processes so sketches can be merged.
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def hash_values(values: Iterable[str]) -> np.ndarray:
+    return np.fromiter((hash64(value) for value in values), dtype=np.uint64)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count estimator.
+
+    `2 ** precision` one-byte registers keep the longest run of leading zero
+    bits seen per hash bucket; the relative error is about
+    `1.04 / sqrt(2 ** precision)`, 0.8% for the default precision of 14 with
+    16 KiB of registers. Hashes are added in NumPy batches, and sketches built
+    with the same precision can be merged.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values: Iterable[str]) -> None:
+        self.add_hashes(hash_values(values))
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        suffix_bits = 64 - self.precision
+        buckets = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        ranks = (suffix_bits + 1 - _bit_length(suffix)).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class CountMinSketch:
+    """
+    Count-min frequency estimator.
+
+    A `depth` x `width` table of counters; each key increments one counter per
+    row and its estimate is the minimum over its rows. Estimates never
+    undercount and overcount by at most `e / width` of the total with
+    probability `1 - exp(-depth)`. Row positions are derived from one 64-bit
+    hash by double hashing.
+    """
+
+    def __init__(self, width: int = 1 << 16, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, values: Iterable[str], counts=1) -> None:
+        self.add_hashes(hash_values(values), counts)
+
+    def add_hashes(self, hashes: np.ndarray, counts=1) -> None:
+        positions = self._positions(hashes)
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), positions.shape[1:])
+        for row in range(self.depth):
+            np.add.at(self.table[row], positions[row], counts)
+        self.total += int(counts.sum())
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if other.table.shape != self.table.shape:
+            raise ValueError("Cannot merge count-min sketches with different dimensions")
+        self.table += other.table
+        self.total += other.total
+
+    def estimate(self, values: Iterable[str]) -> np.ndarray:
+        return self.estimate_hashes(hash_values(values))
+
+    def estimate_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        positions = self._positions(hashes)
+        return self.table[np.arange(self.depth)[:, None], positions].min(axis=0)
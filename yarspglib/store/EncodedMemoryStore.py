@@ -0,0 +1,145 @@
+from array import array
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from rdflib import URIRef
+from rdflib.store import Store
+from yarspglib.triple_query import TriplePermutations
+
+
+class EncodedMemoryStore(Store):
+    """
+    In-memory rdflib store holding triples as integer-encoded NumPy arrays.
+
+    Every distinct term is stored once and replaced by an integer id. Added
+    triples are appended to a flat id buffer; on the first read the buffer is
+    merged into `TriplePermutations`, three sorted index arrays (SPO, POS and
+    OSP) which answer triple patterns with binary searches. This makes bulk loading through `addN` cheap
+    and keeps memory at a few dozen bytes per triple, while `Graph.serialize` and
+    SPARQL queries keep working through the regular `triples` interface.
+
+    Small batches added between reads go into a separate sorted delta index
+    which is queried next to the base one, so interleaved adds and reads do not
+    re-sort the whole graph each time. The delta is merged into the base once
+    it holds more than `1 / DELTA_FRACTION` of its rows.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    DELTA_MIN_ROWS = 4096
+    DELTA_FRACTION = 8
+
+    def __init__(self, configuration: Optional[str] = None, identifier=None):
+        super().__init__(configuration)
+        self.identifier = identifier
+        self.terms = []
+        self.term_ids = {}
+        self._pending = array('q')
+        self._triples = TriplePermutations.empty()
+        self._delta = TriplePermutations.empty()
+        self._namespace = {}
+        self._prefix = {}
+
+    def _encode(self, term) -> int:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.terms.append(term)
+            self.term_ids[term] = term_id
+        return term_id
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        Store.add(self, triple, context, quoted)
+        s, p, o = triple
+        self._pending.extend((self._encode(s), self._encode(p), self._encode(o)))
+
+    def addN(self, quads) -> None:
+        encode = self._encode
+        pending = self._pending
+        for s, p, o, _ in quads:
+            pending.extend((encode(s), encode(p), encode(o)))
+
+    def _delta_limit(self) -> int:
+        return max(self.DELTA_MIN_ROWS, len(self._triples) // self.DELTA_FRACTION)
+
+    def build(self) -> None:
+        """
+        Merge pending triples into the sorted SPO, POS and OSP indexes.
+
+        A few pending triples are inserted into the delta index; larger batches
+        or an oversized delta rebuild the base index from everything.
+        """
+        if not self._pending:
+            return
+        dtype = np.int32 if len(self.terms) < 2 ** 31 else np.int64
+        pending = np.frombuffer(self._pending, dtype=np.int64).reshape(-1, 3)
+        self._pending = array('q')
+        if dtype == self._delta.spo.dtype and len(pending) + len(self._delta) <= self._delta_limit():
+            for s, p, o in pending.tolist():
+                if not self._triples.count(s, p, o):
+                    self._delta.insert(s, p, o)
+            return
+        spo = np.concatenate((self._triples.spo.astype(dtype), self._delta.spo.astype(dtype), pending.astype(dtype)))
+        self._triples = TriplePermutations.build(spo)
+        self._delta = TriplePermutations.empty(dtype)
+
+    def _lookup(self, triple) -> Optional[list]:
+        ids = []
+        for term in triple:
+            if term is None:
+                ids.append(None)
+                continue
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                return None
+            ids.append(term_id)
+        return ids
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        self.build()
+        ids = self._lookup(triple_pattern)
+        if ids is None:
+            return
+        terms = self.terms
+        for index in (self._triples, self._delta):
+            for s, p, o in index.match(*ids).tolist():
+                yield (terms[s], terms[p], terms[o]), iter(())
+
+    def remove(self, triple_pattern, context=None) -> None:
+        Store.remove(self, triple_pattern, context)
+        self.build()
+        ids = self._lookup(triple_pattern)
+        if ids is None:
+            return
+        self._triples.discard(*ids)
+        self._delta.discard(*ids)
+
+    def __len__(self, context=None) -> int:
+        self.build()
+        return len(self._triples) + len(self._delta)
+
+    def contexts(self, triple=None) -> Iterator:
+        return iter(())
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if not override and (bound_namespace is not None or bound_prefix is not None):
+            return
+        if bound_prefix is not None:
+            del self._namespace[bound_prefix]
+        if bound_namespace is not None:
+            del self._prefix[bound_namespace]
+        self._prefix[namespace] = prefix
+        self._namespace[prefix] = namespace
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        return iter(list(self._namespace.items()))
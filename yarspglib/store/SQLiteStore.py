@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+from typing import Iterator, Optional, Tuple
+from rdflib import URIRef, Literal, BNode
+from rdflib.store import Store, VALID_STORE, NO_STORE
+
+
+class SQLiteNodeTable:
+    """
+    Node table of a YARS-PG parse kept in a `nodes` table of the store database.
+
+    Maps node ids to the `{'type', 'properties'}` objects the handler looks up
+    when it turns edges into triples, so parsing into a SQLite store does not
+    hold every node in memory. New nodes are buffered and inserted in batches
+    of `batch_size`; lookups check the buffer first. The table is dropped on
+    `close`.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, batch_size: int = 50000):
+        self.connection = connection
+        self.batch_size = batch_size
+        self._pending = {}
+        with self.connection:
+            self.connection.execute("DROP TABLE IF EXISTS nodes")
+            self.connection.execute("CREATE TABLE nodes (id TEXT PRIMARY KEY, type TEXT NOT NULL, "
+                                    "properties TEXT NOT NULL) WITHOUT ROWID")
+
+    def flush(self) -> None:
+        if self._pending:
+            with self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?, ?)",
+                                            ((node_id, obj['type'], json.dumps(obj['properties']))
+                                             for node_id, obj in self._pending.items()))
+            self._pending = {}
+
+    def get(self, node_id: str, default: Optional[dict] = None) -> Optional[dict]:
+        obj = self._pending.get(node_id)
+        if obj is not None:
+            return obj
+        row = self.connection.execute("SELECT type, properties FROM nodes WHERE id = ?", (node_id,)).fetchone()
+        return default if row is None else {'type': row[0], 'properties': json.loads(row[1])}
+
+    def __contains__(self, node_id: str) -> bool:
+        return self.get(node_id) is not None
+
+    def __getitem__(self, node_id: str) -> dict:
+        obj = self.get(node_id)
+        if obj is None:
+            raise KeyError(node_id)
+        return obj
+
+    def __setitem__(self, node_id: str, obj: dict) -> None:
+        self._pending[node_id] = obj
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def close(self) -> None:
+        self._pending = {}
+        with self.connection:
+            self.connection.execute("DROP TABLE IF EXISTS nodes")
+
+
+class SQLiteStore(Store):
+    """
+    On-disk rdflib store backed by a local SQLite database.
+
+    Terms are stored as tagged strings in a single `triples` table. Added triples
+    are buffered and written with `executemany` in batched transactions, with
+    the database in WAL mode. The SPO, POS and OSP indexes are only created,
+    after removing duplicate rows, on the first read or when the store is closed,
+    so bulk loads do not pay for index maintenance. Once indexed, the database
+    can be reopened later to re-serialize or query the graph without re-parsing.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration: Optional[str] = None, identifier=None, batch_size: int = 50000):
+        self.connection = None
+        self.batch_size = batch_size
+        self.indexed = False
+        self._pending = []
+        self._namespace = {}
+        self._prefix = {}
+        super().__init__(configuration)
+        self.identifier = identifier
+
+    def open(self, configuration: str, create: bool = False) -> Optional[int]:
+        if not create and not os.path.exists(configuration):
+            return NO_STORE
+        self.connection = sqlite3.connect(configuration)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS triples (s TEXT NOT NULL, p TEXT NOT NULL, o TEXT NOT NULL)")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, namespace TEXT NOT NULL)")
+            self.connection.executemany("INSERT OR REPLACE INTO namespaces VALUES (?, ?)", self._namespace.items())
+        for prefix, namespace in self.connection.execute("SELECT prefix, namespace FROM namespaces"):
+            self._namespace[prefix] = URIRef(namespace)
+            self._prefix[URIRef(namespace)] = prefix
+        self.indexed = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'spo'").fetchone() is not None
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self.connection is None:
+            return
+        self.build_indexes()
+        self.connection.close()
+        self.connection = None
+
+    def destroy(self, configuration: str) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(configuration + suffix):
+                os.remove(configuration + suffix)
+
+    @staticmethod
+    def encode_term(term) -> str:
+        if isinstance(term, Literal):
+            return f"L{term.language or ''}\x1f{term.datatype or ''}\x1f{term}"
+        if isinstance(term, BNode):
+            return f"B{term}"
+        return f"U{term}"
+
+    @staticmethod
+    def decode_term(value: str):
+        kind, value = value[0], value[1:]
+        if kind == 'L':
+            lang, datatype, lexical = value.split("\x1f", 2)
+            return Literal(lexical, lang=lang or None, datatype=URIRef(datatype) if datatype else None)
+        if kind == 'B':
+            return BNode(value)
+        return URIRef(value)
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        Store.add(self, triple, context, quoted)
+        self._pending.append(tuple(self.encode_term(term) for term in triple))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def addN(self, quads) -> None:
+        encode = self.encode_term
+        for s, p, o, _ in quads:
+            self._pending.append((encode(s), encode(p), encode(o)))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def node_table(self) -> SQLiteNodeTable:
+        """
+        Create an empty node table for a YARS-PG parse in the store database.
+        """
+        return SQLiteNodeTable(self.connection, self.batch_size)
+
+    def flush(self) -> None:
+        """
+        Insert buffered triples in a single transaction.
+        """
+        if not self._pending:
+            return
+        statement = "INSERT OR IGNORE INTO triples VALUES (?, ?, ?)" if self.indexed else "INSERT INTO triples VALUES (?, ?, ?)"
+        with self.connection:
+            self.connection.executemany(statement, self._pending)
+        self._pending = []
+
+    def build_indexes(self) -> None:
+        """
+        Remove duplicate triples and create the SPO, POS and OSP indexes.
+        """
+        self.flush()
+        if self.indexed:
+            return
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM triples WHERE rowid NOT IN (SELECT MIN(rowid) FROM triples GROUP BY s, p, o)")
+            self.connection.execute("CREATE UNIQUE INDEX spo ON triples (s, p, o)")
+            self.connection.execute("CREATE INDEX pos ON triples (p, o, s)")
+            self.connection.execute("CREATE INDEX osp ON triples (o, s, p)")
+        self.indexed = True
+
+    def _where(self, triple_pattern) -> Tuple[str, list]:
+        clauses = []
+        params = []
+        for column, term in zip(("s", "p", "o"), triple_pattern):
+            if term is not None:
+                clauses.append(f"{column} = ?")
+                params.append(self.encode_term(term))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        self.build_indexes()
+        where, params = self._where(triple_pattern)
+        decode = self.decode_term
+        cursor = self.connection.execute(f"SELECT s, p, o FROM triples{where}", params)
+        for s, p, o in cursor:
+            yield (decode(s), decode(p), decode(o)), iter(())
+
+    def remove(self, triple_pattern, context=None) -> None:
+        Store.remove(self, triple_pattern, context)
+        self.build_indexes()
+        where, params = self._where(triple_pattern)
+        with self.connection:
+            self.connection.execute(f"DELETE FROM triples{where}", params)
+
+    def __len__(self, context=None) -> int:
+        self.build_indexes()
+        return self.connection.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    def contexts(self, triple=None) -> Iterator:
+        return iter(())
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if not override and (bound_namespace is not None or bound_prefix is not None):
+            return
+        if bound_prefix is not None:
+            del self._namespace[bound_prefix]
+        if bound_namespace is not None:
+            del self._prefix[bound_namespace]
+        self._prefix[namespace] = prefix
+        self._namespace[prefix] = namespace
+        if self.connection is not None:
+            with self.connection:
+                self.connection.execute("DELETE FROM namespaces WHERE prefix = ? OR namespace = ?", (bound_prefix, namespace))
+                self.connection.execute("INSERT OR REPLACE INTO namespaces VALUES (?, ?)", (prefix, str(namespace)))
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        return iter(list(self._namespace.items()))
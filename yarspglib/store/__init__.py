@@ -0,0 +1,5 @@
+from rdflib import plugin
+from rdflib.store import Store
+
+plugin.register('YARSpgEncoded', Store, 'yarspglib.store.EncodedMemoryStore', 'EncodedMemoryStore')
+plugin.register('YARSpgSQLite', Store, 'yarspglib.store.SQLiteStore', 'SQLiteStore')
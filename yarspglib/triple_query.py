@@ -0,0 +1,318 @@
+import os
+import urllib.parse
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from rdflib import URIRef, Literal
+from rdflib.term import Variable
+from yarspglib.sketches import hash64, hash_values
+from yarspglib.ycol_snapshot import YColSnapshot
+
+
+class TriplePermutations:
+    """
+    Integer triples kept in three sorted permutations: SPO, POS and OSP.
+
+    Each permutation is an `(n, 3)` array whose columns follow the order in its
+    name, sorted lexicographically and free of duplicates. Any triple pattern
+    has its bound positions as a prefix of one permutation, so matches are a
+    contiguous row range found with `np.searchsorted`.
+    """
+
+    ORDERS = {
+        'spo': (0, 1, 2),
+        'pos': (1, 2, 0),
+        'osp': (2, 0, 1),
+    }
+
+    def __init__(self, permutations: Dict[str, np.ndarray]):
+        self.permutations = permutations
+
+    @classmethod
+    def build(cls, spo: np.ndarray) -> "TriplePermutations":
+        permutations = {}
+        for name, columns in cls.ORDERS.items():
+            rows = spo[:, columns]
+            rows = rows[np.lexsort((rows[:, 2], rows[:, 1], rows[:, 0]))]
+            if len(rows) > 1:
+                keep = np.empty(len(rows), dtype=bool)
+                keep[0] = True
+                np.any(rows[1:] != rows[:-1], axis=1, out=keep[1:])
+                rows = rows[keep]
+            permutations[name] = np.ascontiguousarray(rows)
+        return cls(permutations)
+
+    @classmethod
+    def empty(cls, dtype=np.int32) -> "TriplePermutations":
+        return cls({name: np.empty((0, 3), dtype=dtype) for name in cls.ORDERS})
+
+    @classmethod
+    def load(cls, path: str) -> "TriplePermutations":
+        return cls({name: np.load(os.path.join(path, f"index_{name}.npy"), mmap_mode='r') for name in cls.ORDERS})
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return all(os.path.isfile(os.path.join(path, f"index_{name}.npy")) for name in cls.ORDERS)
+
+    def save(self, path: str) -> None:
+        for name, rows in self.permutations.items():
+            np.save(os.path.join(path, f"index_{name}.npy"), rows)
+
+    @property
+    def spo(self) -> np.ndarray:
+        return self.permutations['spo']
+
+    def __len__(self) -> int:
+        return len(self.spo)
+
+    def _range(self, s, p, o) -> Tuple[str, int, int]:
+        if s is not None:
+            name = 'spo' if o is None or p is not None else 'osp'
+        elif p is not None:
+            name = 'pos'
+        elif o is not None:
+            name = 'osp'
+        else:
+            name = 'spo'
+        lo, hi = self._bounds(name, (s, p, o))
+        return name, lo, hi
+
+    def _bounds(self, name: str, pattern) -> Tuple[int, int]:
+        rows = self.permutations[name]
+        lo, hi = 0, len(rows)
+        for column, key in enumerate(pattern[c] for c in self.ORDERS[name]):
+            if key is None:
+                break
+            # A key of another dtype makes searchsorted cast the whole column first
+            key = rows.dtype.type(key)
+            values = rows[lo:hi, column]
+            lo, hi = lo + int(values.searchsorted(key, 'left')), lo + int(values.searchsorted(key, 'right'))
+        return lo, hi
+
+    def insert(self, s: int, p: int, o: int) -> bool:
+        """
+        Insert one triple into all three permutations in place, keeping them sorted.
+
+        Each insertion copies the permutations, so this is meant for small
+        indexes; returns False if the triple was already present.
+        """
+        triple = (s, p, o)
+        positions = {}
+        for name in self.ORDERS:
+            lo, hi = self._bounds(name, triple)
+            if hi > lo:
+                return False
+            positions[name] = lo
+        for name, columns in self.ORDERS.items():
+            rows, position = self.permutations[name], positions[name]
+            row = np.array([[triple[c] for c in columns]], dtype=rows.dtype)
+            self.permutations[name] = np.concatenate((rows[:position], row, rows[position:]))
+        return True
+
+    def discard(self, s=None, p=None, o=None) -> None:
+        """
+        Remove the triples matching a pattern from all three permutations in place.
+        """
+        if not self.count(s, p, o):
+            return
+        pattern = (s, p, o)
+        for name, columns in self.ORDERS.items():
+            rows = self.permutations[name]
+            matched = np.ones(len(rows), dtype=bool)
+            for position, column in enumerate(columns):
+                if pattern[column] is not None:
+                    matched &= rows[:, position] == pattern[column]
+            self.permutations[name] = rows[~matched]
+
+    def count(self, s=None, p=None, o=None) -> int:
+        _, lo, hi = self._range(s, p, o)
+        return hi - lo
+
+    def match(self, s=None, p=None, o=None) -> np.ndarray:
+        """
+        Return the matching triples as an `(k, 3)` array in subject, predicate, object order.
+        """
+        name, lo, hi = self._range(s, p, o)
+        rows = self.permutations[name][lo:hi]
+        if name == 'spo':
+            return rows
+        return rows[:, np.argsort(self.ORDERS[name])]
+
+
+class TripleQueryEngine:
+    """
+    Answers triple patterns and basic graph patterns over a ycol snapshot.
+
+    Subjects and objects are node codes from the snapshot node table and
+    predicates are predicate codes. The SPO/POS/OSP permutations are stored in
+    the snapshot directory the first time they are built, so later engines
+    memory-map them instead of sorting again. Terms are looked up by the BLAKE2b
+    hash of their node value in a sorted hash index, which is saved next to the
+    permutations on the first lookup. Patterns are tuples whose items are
+    rdflib terms, `Variable`s or strings starting with `?`.
+    """
+
+    def __init__(self, snapshot: YColSnapshot):
+        self.snapshot = snapshot
+        if TriplePermutations.exists(snapshot.path):
+            self.triples = TriplePermutations.load(snapshot.path)
+        else:
+            spo = np.stack((snapshot.edge_sources, snapshot.edge_predicates.astype(snapshot.edge_sources.dtype),
+                            snapshot.edge_targets), axis=1)
+            self.triples = TriplePermutations.build(spo)
+            if os.access(snapshot.path, os.W_OK):
+                self.triples.save(snapshot.path)
+        self.predicate_codes = {value: code for code, value in enumerate(snapshot.predicates)}
+        self._value_hashes = None
+        self._value_order = None
+
+    @staticmethod
+    def is_variable(item) -> bool:
+        return isinstance(item, Variable) or (isinstance(item, str) and not isinstance(item, (URIRef, Literal))
+                                              and item.startswith('?'))
+
+    @staticmethod
+    def variable_name(item) -> str:
+        return str(item).lstrip('?')
+
+    def _load_value_index(self) -> None:
+        hashes_file = os.path.join(self.snapshot.path, "index_value_hashes.npy")
+        order_file = os.path.join(self.snapshot.path, "index_value_order.npy")
+        if os.path.isfile(hashes_file) and os.path.isfile(order_file):
+            self._value_hashes = np.load(hashes_file, mmap_mode='r')
+            self._value_order = np.load(order_file, mmap_mode='r')
+            return
+        hashes = hash_values(self.snapshot.node_values)
+        self._value_order = np.argsort(hashes, kind='stable').astype(self.snapshot.edge_sources.dtype)
+        self._value_hashes = hashes[self._value_order]
+        if os.access(self.snapshot.path, os.W_OK):
+            np.save(hashes_file, self._value_hashes)
+            np.save(order_file, self._value_order)
+
+    def node_code(self, term) -> Optional[int]:
+        """
+        Find the node code of an rdflib term, or None if the graph does not contain it.
+        """
+        if self._value_hashes is None:
+            self._load_value_index()
+        candidates = {str(term)}
+        if isinstance(term, URIRef):
+            candidates.add(urllib.parse.unquote(term))
+        for value in candidates:
+            key = np.uint64(hash64(value))
+            lo = int(np.searchsorted(self._value_hashes, key, 'left'))
+            hi = int(np.searchsorted(self._value_hashes, key, 'right'))
+            for code in self._value_order[lo:hi].tolist():
+                if self.snapshot.node_term(code) == term:
+                    return code
+        return None
+
+    def predicate_code(self, term) -> Optional[int]:
+        code = self.predicate_codes.get(str(term))
+        if code is None:
+            code = self.predicate_codes.get(urllib.parse.unquote(term))
+        return code
+
+    def _resolve(self, pattern) -> Optional[list]:
+        codes = []
+        for position, item in enumerate(pattern):
+            if item is None or self.is_variable(item):
+                codes.append(None)
+                continue
+            code = self.predicate_code(item) if position == 1 else self.node_code(item)
+            if code is None:
+                return None
+            codes.append(code)
+        return codes
+
+    def match(self, pattern) -> np.ndarray:
+        """
+        Return the `(k, 3)` code triples matching a single triple pattern.
+        """
+        codes = self._resolve(pattern)
+        if codes is None:
+            return np.empty((0, 3), dtype=self.triples.spo.dtype)
+        return self.triples.match(*codes)
+
+    def _bindings(self, pattern) -> Dict[str, np.ndarray]:
+        rows = self.match(pattern)
+        bindings = {}
+        mask = np.ones(len(rows), dtype=bool)
+        for position, item in enumerate(pattern):
+            if not self.is_variable(item):
+                continue
+            name = self.variable_name(item)
+            if name in bindings:
+                mask &= bindings[name] == rows[:, position]
+            else:
+                bindings[name] = rows[:, position]
+        return {name: column[mask] for name, column in bindings.items()}
+
+    @staticmethod
+    def _join(left: Dict[str, np.ndarray], right: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        shared = [name for name in left if name in right]
+        left_size = len(next(iter(left.values()))) if left else 0
+        right_size = len(next(iter(right.values()))) if right else 0
+        if not shared:
+            left_rows = np.repeat(np.arange(left_size), right_size)
+            right_rows = np.tile(np.arange(right_size), left_size)
+        else:
+            key = shared[0]
+            order = np.argsort(right[key], kind='stable')
+            right_keys = right[key][order]
+            lo = np.searchsorted(right_keys, left[key], 'left')
+            hi = np.searchsorted(right_keys, left[key], 'right')
+            counts = hi - lo
+            left_rows = np.repeat(np.arange(left_size), counts)
+            right_rows = order[np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+        joined = {name: column[left_rows] for name, column in left.items()}
+        mask = np.ones(len(left_rows), dtype=bool)
+        for name, column in right.items():
+            if name in joined:
+                mask &= joined[name] == column[right_rows]
+            else:
+                joined[name] = column[right_rows]
+        return {name: column[mask] for name, column in joined.items()}
+
+    def query(self, patterns: List[tuple]) -> Dict[str, np.ndarray]:
+        """
+        Evaluate a basic graph pattern and return one code column per variable.
+
+        Patterns are evaluated from the most to the least selective, and each
+        one is merge-joined with the bindings gathered so far.
+        """
+        predicate_variables = {self.variable_name(p[1]) for p in patterns if self.is_variable(p[1])}
+        node_variables = {self.variable_name(item) for p in patterns for item in (p[0], p[2]) if self.is_variable(item)}
+        if predicate_variables & node_variables:
+            raise ValueError("A variable cannot be used both as a predicate and as a subject or object")
+        resolved = []
+        for pattern in patterns:
+            codes = self._resolve(pattern)
+            if codes is None:
+                return {self.variable_name(item): np.empty(0, dtype=np.int64)
+                        for pattern in patterns for item in pattern if self.is_variable(item)}
+            resolved.append((self.triples.count(*codes), pattern))
+        bindings = None
+        remaining = [pattern for _, pattern in sorted(resolved, key=lambda item: item[0])]
+        while remaining:
+            if bindings is None:
+                pattern = remaining.pop(0)
+            else:
+                connected = [p for p in remaining
+                             if any(self.is_variable(item) and self.variable_name(item) in bindings for item in p)]
+                pattern = connected[0] if connected else remaining[0]
+                remaining.remove(pattern)
+            found = self._bindings(pattern)
+            bindings = found if bindings is None else self._join(bindings, found)
+        return bindings or {}
+
+    def select(self, patterns: List[tuple]) -> Iterator[Dict[str, object]]:
+        """
+        Evaluate a basic graph pattern and yield each solution with rdflib terms.
+        """
+        predicate_variables = {self.variable_name(pattern[1]) for pattern in patterns if self.is_variable(pattern[1])}
+        bindings = self.query(patterns)
+        names = list(bindings)
+        columns = [bindings[name].tolist() for name in names]
+        for row in zip(*columns):
+            yield {name: self.snapshot.predicate_term(code) if name in predicate_variables
+                   else self.snapshot.node_term(code) for name, code in zip(names, row)}
@@ -0,0 +1,132 @@
+import json
+import os
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader
+
+
+class YARSpgIndex:
+    """
+    Memory-mapped sidecar index from node ids to byte offsets in a YARS-PG file.
+
+    The index is a directory next to the file (`FILE.yidx` by default) holding
+    the sorted node ids as a fixed-width byte array, the offset of each node
+    statement and, in CSR layout, the offsets of the edges leaving each node.
+    Variable declarations and namespace prefixes are kept in the metadata so
+    statements referencing them decode without rereading the file.
+    Lookups binary-search the id array and only read and decode the requested
+    lines of the YARS-PG file.
+    """
+
+    def __init__(self, yarspg_file: str, index_path: Optional[str] = None):
+        self.yarspg_file = yarspg_file
+        self.index_path = index_path or f"{yarspg_file}.yidx"
+        with open(os.path.join(self.index_path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.ids = self._array('ids')
+        self.node_offsets = self._array('node_offsets')
+        self.edge_ptr = self._array('edge_ptr')
+        self.edge_offsets = self._array('edge_offsets')
+
+    def _array(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.index_path, f"{name}.npy"), mmap_mode='r')
+
+    @staticmethod
+    def _file_stamp(yarspg_file: str) -> dict:
+        stat = os.stat(yarspg_file)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    @classmethod
+    def open(cls, yarspg_file: str, index_path: Optional[str] = None) -> "YARSpgIndex":
+        """
+        Open the index of a YARS-PG file, building it first if it is missing or stale.
+        """
+        index_path = index_path or f"{yarspg_file}.yidx"
+        if not cls.is_current(yarspg_file, index_path):
+            cls.build(yarspg_file, index_path)
+        return cls(yarspg_file, index_path)
+
+    @classmethod
+    def is_current(cls, yarspg_file: str, index_path: Optional[str] = None) -> bool:
+        """
+        Check whether an index exists and was built from the current version of the file.
+        """
+        meta_file = os.path.join(index_path or f"{yarspg_file}.yidx", "meta.json")
+        if not os.path.isfile(meta_file):
+            return False
+        with open(meta_file, "r", encoding="utf-8") as f:
+            return json.load(f).get('file') == cls._file_stamp(yarspg_file)
+
+    @classmethod
+    def build(cls, yarspg_file: str, index_path: Optional[str] = None) -> None:
+        """
+        Scan a YARS-PG file once and write its sidecar index.
+        """
+        index_path = index_path or f"{yarspg_file}.yidx"
+        node_ids, node_offsets, edge_sources, edge_offsets = [], [], [], []
+        with open(yarspg_file, "rb") as f:
+            reader = YARSpgStatementReader(f)
+            for entry in reader.scan():
+                if entry[0] == 'node':
+                    node_ids.append(entry[2])
+                    node_offsets.append(entry[1])
+                else:
+                    edge_sources.append(entry[2])
+                    edge_offsets.append(entry[1])
+
+        node_keys = np.array([node_id.encode("utf-8") for node_id in node_ids], dtype=np.bytes_)
+        source_keys = np.array([source.encode("utf-8") for source in edge_sources], dtype=np.bytes_)
+        ids = np.unique(np.concatenate((node_keys, source_keys)))
+        offsets = np.full(len(ids), -1, dtype=np.int64)
+        offsets[np.searchsorted(ids, node_keys)] = node_offsets
+        sources = np.searchsorted(ids, source_keys)
+        order = np.argsort(sources, kind='stable')
+        edge_ptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(ids)), out=edge_ptr[1:])
+
+        os.makedirs(index_path, exist_ok=True)
+        np.save(os.path.join(index_path, "ids.npy"), ids)
+        np.save(os.path.join(index_path, "node_offsets.npy"), offsets)
+        np.save(os.path.join(index_path, "edge_ptr.npy"), edge_ptr)
+        np.save(os.path.join(index_path, "edge_offsets.npy"), np.array(edge_offsets, dtype=np.int64)[order])
+        with open(os.path.join(index_path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({'file': cls._file_stamp(yarspg_file), 'ids': len(ids), 'edges': len(edge_offsets),
+                       'variables': reader.variables, 'prefixes': reader.prefixes}, f)
+
+    def find(self, node_id: str) -> Optional[Tuple[int, List[int]]]:
+        """
+        Return the node statement offset (-1 if the node is only referenced by
+        edges) and the offsets of its outgoing edges, or None for unknown ids.
+        """
+        key = node_id.encode("utf-8")
+        position = int(np.searchsorted(self.ids, key))
+        if position >= len(self.ids) or self.ids[position] != key:
+            return None
+        start, end = int(self.edge_ptr[position]), int(self.edge_ptr[position + 1])
+        return int(self.node_offsets[position]), self.edge_offsets[start:end].tolist()
+
+    def read_lines(self, node_id: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield `(offset, line)` for the node statement and outgoing edges of a node.
+        """
+        found = self.find(node_id)
+        if found is None:
+            return
+        node_offset, edge_offsets = found
+        offsets = ([node_offset] if node_offset >= 0 else []) + edge_offsets
+        with open(self.yarspg_file, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                yield offset, f.readline().decode("utf-8").strip()
+
+    def lookup(self, node_id: str) -> list:
+        """
+        Fetch and decode the node statement and outgoing edges of a node.
+        """
+        reader = YARSpgStatementReader(None)
+        reader.variables = self.meta.get('variables', {})
+        reader.prefixes = self.meta.get('prefixes', {})
+        statements = []
+        for offset, line in self.read_lines(node_id):
+            statements.extend(reader.read_line(line, offset))
+        return statements
@@ -1,25 +1,265 @@
 import gzip
+import json
+import os
+import tempfile
+from typing import Iterator, Optional
 import brotli
 import zstandard as zstd
 import snappy
 from rdflib import Graph
-from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer, lexical_literals
+from yarspglib.serializer.ParallelIngest import ParallelNTriplesIngest
 from yarspglib.parser.YARSpgProcessor import YARSpgProcessor
+from yarspglib.parser.RDFStreamWriter import STREAM_WRITERS
+from yarspglib.store.EncodedMemoryStore import EncodedMemoryStore
+from yarspglib.store.SQLiteStore import SQLiteStore
+from yarspglib.parser.YARSpgHandler import YARSpgHandler
+from yarspglib.parser.YARSpgStatementReader import YARSpgStatementReader
+from yarspglib.ycol_snapshot import YColSnapshot, write_ycol, ycol_compatible
+from yarspglib.yarspg_index import YARSpgIndex
+from yarspglib.node_dictionary import NodeDictionary
+from yarspglib.graph_diff import diff_yarspg
+from yarspglib.graph_merge import YARSpgMerger
+from yarspglib.graph_filter import EdgeFilter, SubgraphExtractor
+from yarspglib.graph_stats import yarspg_statistics, ntriples_statistics
 
-def serialize_rdf_to_yarspg(input_file: str, output_file: str) -> None:
+def serialize_rdf_to_yarspg(input_file: str, output_file: str, id_scheme: str = 'counter',
+                            jobs: Optional[int] = None, predicate_variables: bool = False,
+                            namespace_prefixes: bool = False, fold_literals: bool = False,
+                            type_labels: bool = False, collapse_reification: bool = False,
+                            native_types: bool = False) -> None:
+    if jobs:
+        if id_scheme != 'counter':
+            raise ValueError("Parallel ingestion only supports the counter id scheme")
+        if namespace_prefixes or fold_literals or type_labels or collapse_reification or native_types:
+            raise ValueError("Parallel ingestion only supports the predicate variables output option")
+        ingest = ParallelNTriplesIngest(input_file, jobs, predicate_variables=predicate_variables)
+        ingest.run()
+        with open(output_file, "wb") as f:
+            ingest.serialize(f)
+        print('Number of nodes:', len(ingest.node_ids))
+        print('Number of edges:', len(ingest.edges))
+        return
     graph = Graph()
-    graph.parse(input_file, format="nt")
-    serializer = YARSpgSerializer(graph)
+    with lexical_literals():
+        graph.parse(input_file, format="nt")
+    serializer = YARSpgSerializer(graph, id_scheme=id_scheme, predicate_variables=predicate_variables,
+                                  namespace_prefixes=namespace_prefixes, fold_literals=fold_literals,
+                                  type_labels=type_labels, collapse_reification=collapse_reification,
+                                  native_types=native_types)
     with open(output_file, "wb") as f:
         serializer.serialize(f)
 
-def parse_yarspg(input_file: str, output_file: str, rdf_format: str) -> None:
-    with open(input_file, "r", encoding="utf8") as file:
-        yarspg_data = file.read()
-    processor = YARSpgProcessor()
-    processor.process_YARSpg(yarspg_data)
+def serialize_rdf_to_shards(input_file: str, output_dir: str, shard_count: int, id_scheme: str = 'counter',
+                            predicate_variables: bool = False, namespace_prefixes: bool = False,
+                            fold_literals: bool = False, type_labels: bool = False,
+                            collapse_reification: bool = False, native_types: bool = False) -> None:
+    if shard_count < 1:
+        raise ValueError("The number of shards must be at least 1")
+    graph = Graph()
+    with lexical_literals():
+        graph.parse(input_file, format="nt")
+    serializer = YARSpgSerializer(graph, id_scheme=id_scheme, predicate_variables=predicate_variables,
+                                  namespace_prefixes=namespace_prefixes, fold_literals=fold_literals,
+                                  type_labels=type_labels, collapse_reification=collapse_reification,
+                                  native_types=native_types)
+    manifest = serializer.serialize_shards(output_dir, shard_count)
+    print(f"Serialized {manifest['nodes']} nodes and {manifest['edges']} edges into {shard_count} shards: {output_dir}")
+
+def append_rdf_to_yarspg(input_file: str, yarspg_file: str, dictionary_path: Optional[str] = None) -> None:
+    graph = Graph()
+    with lexical_literals():
+        graph.parse(input_file, format="nt")
+    if not os.path.exists(yarspg_file):
+        open(yarspg_file, "wb").close()
+    dictionary = NodeDictionary.open(yarspg_file, dictionary_path)
+    serializer = YARSpgSerializer(graph, dictionary)
+    with open(yarspg_file, "ab") as f:
+        start = f.tell()
+        if start:
+            f.write(b"\n")
+        serializer.serialize(f)
+    dictionary.add_segment(start)
+    dictionary.close()
+
+def open_graph(store: Optional[str] = None) -> Graph:
+    if store is None or store == 'memory':
+        return Graph()
+    if store == 'encoded':
+        return Graph(store=EncodedMemoryStore())
+    if store.startswith('sqlite:'):
+        path = store[len('sqlite:'):]
+        graph = Graph(store=SQLiteStore())
+        graph.store.destroy(path)
+        graph.open(path, create=True)
+        return graph
+    raise ValueError(f"Unknown store: {store}")
+
+def parse_yarspg(input_file: str, output_file: str, rdf_format: str, store: Optional[str] = None,
+                 expand_reification: bool = False) -> None:
+    if store is None and rdf_format in STREAM_WRITERS:
+        with open(input_file, "r", encoding="utf8") as file:
+            yarspg_data = file.read()
+        with open(output_file, "wb") as f:
+            writer = STREAM_WRITERS[rdf_format](f)
+            processor = YARSpgProcessor(writer, expand_reification=expand_reification)
+            processor.process_YARSpg(yarspg_data)
+            writer.close()
+        return
+    graph = open_graph(store)
+    if isinstance(graph.store, SQLiteStore):
+        nodes = graph.store.node_table()
+        processor = YARSpgProcessor(graph, expand_reification=expand_reification, nodes=nodes)
+        with open(input_file, "rb") as f:
+            processor.process_YARSpg_stream(f)
+        nodes.close()
+    else:
+        with open(input_file, "r", encoding="utf8") as file:
+            yarspg_data = file.read()
+        processor = YARSpgProcessor(graph, expand_reification=expand_reification)
+        processor.process_YARSpg(yarspg_data)
     with open(output_file, "wb") as f:
         processor.graph.serialize(f, format=rdf_format, encoding="utf-8")
+    processor.graph.close()
+
+def convert_yarspg(input_path: str, output_path: str, target: str, expand_reification: bool = False) -> None:
+    if YColSnapshot.is_snapshot(input_path):
+        snapshot = YColSnapshot(input_path)
+        if target == 'yarspg':
+            with open(output_path, "wb") as f:
+                snapshot.write_yarspg(f)
+        elif target == 'ycol':
+            write_ycol(snapshot.statements(), output_path)
+        else:
+            write_statements_rdf(snapshot.statements(), output_path, target, expand_reification)
+        return
+    with open(input_path, "rb") as f:
+        statements = YARSpgStatementReader(f)
+        if target == 'ycol':
+            if all(ycol_compatible(statement) for statement in statements):
+                f.seek(0)
+                write_ycol(YARSpgStatementReader(f), output_path)
+            else:
+                print(f"{input_path} has type labels, folded properties or collapsed reifications, which a ycol "
+                      f"snapshot cannot store; converting its triples as plain nodes and edges instead.")
+                f.seek(0)
+                write_ycol(plain_statements(YARSpgStatementReader(f)), output_path)
+        elif target == 'yarspg':
+            raise ValueError("Input is already a YARS-PG file")
+        else:
+            write_statements_rdf(statements, output_path, target, expand_reification)
+
+def plain_statements(statements) -> Iterator:
+    """
+    Re-serialize YARS-PG statements through their RDF graph without type labels,
+    folded properties or collapsed reifications, so every triple becomes a plain edge.
+    """
+    graph = Graph()
+    handler = YARSpgHandler(graph, expand_reification=True)
+    with lexical_literals():
+        for statement in statements:
+            handler.process_statement(statement)
+        handler.flush()
+    with tempfile.TemporaryFile() as f:
+        YARSpgSerializer(graph).serialize(f)
+        graph.close()
+        f.seek(0)
+        yield from YARSpgStatementReader(f)
+
+def write_statements_rdf(statements, output_file: str, rdf_format: str, expand_reification: bool = False) -> None:
+    with open(output_file, "wb") as f:
+        if rdf_format in STREAM_WRITERS:
+            graph = STREAM_WRITERS[rdf_format](f)
+        else:
+            graph = Graph()
+        handler = YARSpgHandler(graph, expand_reification=expand_reification)
+        for statement in statements:
+            handler.process_statement(statement)
+        handler.flush()
+        if rdf_format in STREAM_WRITERS:
+            graph.close()
+        else:
+            graph.serialize(f, format=rdf_format, encoding="utf-8")
+
+def lookup_yarspg(input_file: str, node_ids, index_path: Optional[str] = None) -> None:
+    index = YARSpgIndex.open(input_file, index_path)
+    for node_id in node_ids:
+        lines = list(index.read_lines(node_id))
+        if not lines:
+            print(f"Node not found: {node_id}")
+        for _, line in lines:
+            print(line)
+
+def stats_yarspg(input_file: str, input_format: Optional[str] = None, top_k: int = 10,
+                 output_file: Optional[str] = None, approximate: bool = False) -> None:
+    if input_format is None:
+        input_format = 'nt' if input_file.endswith(('.nt', '.ntriples')) else 'yarspg'
+    with open(input_file, "rb") as f:
+        if input_format == 'nt':
+            stats = ntriples_statistics(f, top_k, approximate)
+        elif input_format == 'yarspg':
+            stats = yarspg_statistics(f, top_k, approximate)
+        else:
+            raise ValueError(f"Unknown input format: {input_format}")
+    report = json.dumps(stats, indent=2)
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"Statistics file created: {output_file}")
+    else:
+        print(report)
+
+def filter_yarspg(input_file: str, output_file: str, edge_filter: EdgeFilter, output_format: str = 'yarspg',
+                  index_path: Optional[str] = None, expand_reification: bool = False) -> None:
+    extractor = SubgraphExtractor(input_file, edge_filter, index_path)
+    counts = {'metadata': 0, 'node': 0, 'variable': 0, 'edge': 0}
+    if output_format == 'yarspg':
+        with open(output_file, "wb") as f:
+            section = None
+            for kind, line in extractor.extract():
+                if kind != 'metadata' and (section is None or (kind == 'node') != (section == 'node')):
+                    f.write(b"# Nodes\n" if kind == 'node' else b"# Edges\n")
+                    section = kind
+                f.write(line.encode("utf-8") + b"\n")
+                counts[kind] += 1
+    else:
+        reader = YARSpgStatementReader(None)
+        def statements():
+            for kind, line in extractor.extract():
+                counts[kind] += 1
+                yield from reader.read_line(line)
+        write_statements_rdf(statements(), output_file, output_format, expand_reification)
+    print(f"Filtered file created: {output_file} ({counts['node']} nodes, {counts['edge']} edges, "
+          f"{extractor.passes} pass{'es' if extractor.passes > 1 else ''} over the input)")
+
+def diff_yarspg_files(old_file: str, new_file: str, added_file: str, removed_file: str,
+                      output_format: str = 'nt') -> None:
+    if output_format not in ('nt', 'yarspg'):
+        raise ValueError(f"Unknown patch format: {output_format}")
+    counts = {'+': 0, '-': 0}
+    with open(added_file, "w", encoding="utf-8") as added, open(removed_file, "w", encoding="utf-8") as removed:
+        for change, row in diff_yarspg(old_file, new_file):
+            (added if change == '+' else removed).write(row + "\n")
+            counts[change] += 1
+    if output_format == 'yarspg':
+        for patch_file in (added_file, removed_file):
+            graph = Graph()
+            with lexical_literals():
+                graph.parse(patch_file, format="nt")
+            with open(patch_file, "wb") as f:
+                YARSpgSerializer(graph).serialize(f)
+    print(f"Added edges: {counts['+']} ({added_file})")
+    print(f"Removed edges: {counts['-']} ({removed_file})")
+
+def merge_yarspg(input_files, output_file: str, max_memory_nodes: int = 1000000) -> None:
+    with open(output_file, "wb") as f:
+        merger = YARSpgMerger(f, max_memory_nodes)
+        try:
+            merger.merge(input_files)
+        finally:
+            merger.close()
+    print(f"Merged file created: {output_file} ({merger.node_count} nodes, {merger.edge_count} edges, "
+          f"{merger.duplicate_count} duplicate nodes removed)")
 
 def split_yarspg(temp_file: str):
     with open(temp_file, "r", encoding="utf-8") as file:
@@ -33,7 +273,7 @@ def split_yarspg(temp_file: str):
                 section = "nodes"
             elif line_lower.startswith("#edges") or line_lower.startswith("# edges") or line_lower.startswith("%edges") or line_lower.startswith("% edges"):
                 section = "edges"
-            elif section == "nodes":
+            elif section == "nodes" or (section is None and line_lower.startswith("+")):
                 nodes_section.append(line.strip())
             elif section == "edges":
                 edges_section.append(line.strip())
@@ -0,0 +1,237 @@
+import json
+import os
+from typing import IO, Iterator, Optional
+import numpy as np
+from rdflib import URIRef
+from yarspglib.parser.YARSpgHandler import YARSpgHandler
+from yarspglib.parser.YARSpgStatementReader import NodeStatement, EdgeStatement
+from yarspglib.serializer.YARSpgSerializer import YARSpgSerializer
+
+NODE_TYPES = ['IRI', 'Literal', 'BNode']
+NODE_PROPERTIES = {'@value', '@datatype', '@lang'}
+
+
+class StringColumn:
+    """
+    A column of strings stored as one UTF-8 heap and an array of offsets into it.
+    """
+
+    def __init__(self, offsets: np.ndarray, heap: np.ndarray):
+        self.offsets = offsets
+        self.heap = heap
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.heap[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        heap = self.heap.tobytes()
+        offsets = self.offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield heap[start:end].decode("utf-8")
+
+    @staticmethod
+    def build(values: list):
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        heap = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return offsets, heap
+
+
+class YColSnapshot:
+    """
+    Binary columnar snapshot of a YARS-PG graph.
+
+    A snapshot is a directory of `.npy` arrays plus a `meta.json` file. The node
+    table holds the node ids, a type code per node, the `@value` strings and
+    dictionary codes for `@datatype` and `@lang` (-1 when absent). The edge table
+    holds source and target node indexes, an edge label code and a predicate
+    code into the predicate string column. Arrays are memory-mapped on load, so
+    opening a snapshot does not read the graph into memory.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != 'ycol':
+            raise ValueError(f"Not a ycol snapshot: {path}")
+        self.node_ids = self._strings('node_ids')
+        self.node_types = self._array('node_types')
+        self.node_values = self._strings('node_values')
+        self.node_datatypes = self._array('node_datatypes')
+        self.node_langs = self._array('node_langs')
+        self.edge_sources = self._array('edge_sources')
+        self.edge_targets = self._array('edge_targets')
+        self.edge_labels = self._array('edge_labels')
+        self.edge_predicates = self._array('edge_predicates')
+        self.predicates = self._strings('predicates')
+        self.datatypes = self.meta['datatypes']
+        self.langs = self.meta['langs']
+        self._handler = YARSpgHandler(None)
+
+    def _array(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+
+    def _strings(self, name: str) -> StringColumn:
+        return StringColumn(self._array(f"{name}.offsets"), self._array(f"{name}.heap"))
+
+    @staticmethod
+    def is_snapshot(path: str) -> bool:
+        return os.path.isfile(os.path.join(path, "meta.json"))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_types)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_sources)
+
+    def node_props(self, index: int) -> dict:
+        props = {'@value': self.node_values[index]}
+        datatype = self.node_datatypes[index]
+        if datatype >= 0:
+            props['@datatype'] = self.datatypes[datatype]
+        lang = self.node_langs[index]
+        if lang >= 0:
+            props['@lang'] = self.langs[lang]
+        return props
+
+    def node_term(self, index: int):
+        """
+        Resolve a node to the rdflib term `YARSpgHandler` would produce for it.
+        """
+        return self._handler.node_term({'type': NODE_TYPES[self.node_types[index]], 'properties': self.node_props(index)})
+
+    def predicate_term(self, code: int) -> URIRef:
+        return URIRef(self._handler.encode_uri(self.predicates[code]))
+
+    def statements(self) -> Iterator:
+        """
+        Yield the snapshot contents as YARS-PG node and edge statements.
+        """
+        node_ids = list(self.node_ids)
+        datatypes = self.node_datatypes.tolist()
+        langs = self.node_langs.tolist()
+        for index, (n_id, n_type, value) in enumerate(zip(node_ids, self.node_types.tolist(), self.node_values)):
+            props = {'@value': value}
+            if datatypes[index] >= 0:
+                props['@datatype'] = self.datatypes[datatypes[index]]
+            if langs[index] >= 0:
+                props['@lang'] = self.langs[langs[index]]
+            yield NodeStatement(None, n_id, [NODE_TYPES[n_type]], props)
+        predicates = list(self.predicates)
+        for source, target, label, predicate in zip(self.edge_sources.tolist(), self.edge_targets.tolist(),
+                                                    self.edge_labels.tolist(), self.edge_predicates.tolist()):
+            yield EdgeStatement(None, node_ids[source], node_ids[target], [NODE_TYPES[label]],
+                                {'@value': predicates[predicate]})
+
+    def write_yarspg(self, stream: IO[bytes]) -> None:
+        """
+        Write the snapshot back as a YARS-PG file with `# Nodes` and `# Edges` sections.
+        """
+        escape = YARSpgSerializer.escape_string
+        stream.write(b"# Nodes\n")
+        in_edges = False
+        lines = []
+        for statement in self.statements():
+            if isinstance(statement, NodeStatement):
+                props = ", ".join(f"\"{key}\": \"{escape(value)}\"" for key, value in statement.props.items())
+                lines.append(f"({statement.id} {{\"{statement.labels[0]}\"}} [{props}])\n")
+            else:
+                if not in_edges:
+                    lines.append("# Edges\n")
+                    in_edges = True
+                lines.append(f"({statement.source})-({{\"{statement.labels[0]}\"}} "
+                             f"[\"@value\": \"{escape(statement.props['@value'])}\"])->({statement.target})\n")
+            if len(lines) >= 10000:
+                stream.write("".join(lines).encode("utf-8"))
+                lines = []
+        if not in_edges:
+            lines.append("# Edges\n")
+        stream.write("".join(lines).encode("utf-8"))
+
+
+def ycol_compatible(statement) -> bool:
+    """
+    Whether a statement fits the snapshot tables: a single node type label and
+    only term properties, without type labels, folded properties or the
+    annotations of a collapsed reification.
+    """
+    if len(statement.labels) != 1 or statement.labels[0] not in NODE_TYPES:
+        return False
+    if isinstance(statement, NodeStatement):
+        return set(statement.props) <= NODE_PROPERTIES
+    return set(statement.props) == {'@value'}
+
+
+def write_ycol(statements, path: str) -> None:
+    """
+    Write YARS-PG node and edge statements to a ycol snapshot directory.
+    """
+    node_ids, node_types, node_values, node_datatypes, node_langs = [], [], [], [], []
+    edge_sources, edge_targets, edge_labels, edge_predicates = [], [], [], []
+    datatypes, langs, predicates = {}, {}, {}
+    type_codes = {name: code for code, name in enumerate(NODE_TYPES)}
+
+    for statement in statements:
+        if isinstance(statement, NodeStatement):
+            if not ycol_compatible(statement):
+                raise ValueError(f"Node {statement.id} cannot be stored in a ycol snapshot")
+            node_ids.append(statement.id)
+            node_types.append(type_codes[statement.labels[0]])
+            node_values.append(statement.props.get('@value', ''))
+            datatype: Optional[str] = statement.props.get('@datatype')
+            node_datatypes.append(-1 if datatype is None else datatypes.setdefault(datatype, len(datatypes)))
+            lang: Optional[str] = statement.props.get('@lang')
+            node_langs.append(-1 if lang is None else langs.setdefault(lang, len(langs)))
+        elif isinstance(statement, EdgeStatement):
+            if not ycol_compatible(statement):
+                raise ValueError(f"Edge {statement.source}->{statement.target} cannot be stored in a ycol snapshot")
+            edge_sources.append(statement.source)
+            edge_targets.append(statement.target)
+            edge_labels.append(type_codes[statement.labels[0]])
+            edge_predicates.append(predicates.setdefault(statement.props['@value'], len(predicates)))
+
+    node_index = {n_id: index for index, n_id in enumerate(node_ids)}
+    index_type = np.int32 if len(node_ids) < 2 ** 31 else np.int64
+    try:
+        sources = np.array([node_index[n_id] for n_id in edge_sources], dtype=index_type)
+        targets = np.array([node_index[n_id] for n_id in edge_targets], dtype=index_type)
+    except KeyError as e:
+        raise ValueError(f"Edge references undefined node {e}")
+
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.startswith("index_") and name.endswith(".npy"):
+            os.remove(os.path.join(path, name))
+    arrays = {
+        'node_types': np.array(node_types, dtype=np.uint8),
+        'node_datatypes': np.array(node_datatypes, dtype=np.int32),
+        'node_langs': np.array(node_langs, dtype=np.int32),
+        'edge_sources': sources,
+        'edge_targets': targets,
+        'edge_labels': np.array(edge_labels, dtype=np.uint8),
+        'edge_predicates': np.array(edge_predicates, dtype=np.int32),
+    }
+    for name, values in (('node_ids', node_ids), ('node_values', node_values), ('predicates', list(predicates))):
+        arrays[f"{name}.offsets"], arrays[f"{name}.heap"] = StringColumn.build(values)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+    meta = {
+        'format': 'ycol',
+        'version': YColSnapshot.VERSION,
+        'nodes': len(node_ids),
+        'edges': len(edge_sources),
+        'datatypes': list(datatypes),
+        'langs': list(langs),
+    }
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)